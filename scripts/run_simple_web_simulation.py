@@ -21,7 +21,7 @@ import sys
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from sociology_simulation.web_monitor import start_web_servers, get_monitor, LogCapture
+from sociology_simulation.web_monitor import start_web_servers_async, get_monitor, LogCapture
 from sociology_simulation.world import World
 from sociology_simulation.agent import Agent
 from sociology_simulation.trinity import Trinity
@@ -146,20 +146,12 @@ async def run_simulation_async(era_prompt=None, num_agents=None, world_size=None
     monitor = get_monitor()
     log_capture = LogCapture(monitor)
     log_capture.start_capture()
+    shutdown_servers = None
     
     try:
-        # Start web servers
+        # Start web servers on this loop, next to the simulation
         logger.info("Starting web servers...")
-        
-        # Start WebSocket server
-        await monitor.start_websocket_server("localhost", 8765)
-        
-        # Start HTTP server  
-        monitor.setup_http_server("localhost", 8081)
-        http_runner = await monitor.start_http_server("localhost", 8081)
-        
-        logger.info("Web UI available at: http://localhost:8081")
-        logger.info("WebSocket server at: ws://localhost:8765")
+        shutdown_servers = await start_web_servers_async("localhost", ws_port=8765, http_port=8081)
         
         # Create simulation
         logger.info("Creating simulation...")
@@ -249,9 +241,8 @@ async def run_simulation_async(era_prompt=None, num_agents=None, world_size=None
     finally:
         # Cleanup
         log_capture.stop_capture()
-        await monitor.stop_websocket_server()
-        if 'http_runner' in locals():
-            await http_runner.cleanup()
+        if shutdown_servers is not None:
+            await shutdown_servers()
         logger.info("Simulation ended")
 
 
@@ -151,7 +151,9 @@ async def run_simulation_from_config(
         cumulative_deaths = 0
         prev_alive_ids = {a.aid for a in world.agents if a.health > 0}
 
-        for t in range(cfg.runtime.turns):
+        # Read per-turn settings from the plain dataclasses, not the DictConfig
+        runtime_cfg, output_cfg = config.runtime, config.output
+        for t in range(runtime_cfg.turns):
             if monitor and monitor.should_stop():
                 monitor.add_log_entry("INFO", "Stop requested – finishing current turn")
                 print(formatter.format_world_event("Stop requested – ending simulation", "warning"))
@@ -189,7 +191,7 @@ async def run_simulation_from_config(
 
             formatter.update_stats(
                 active_agents=len(post_alive_ids),
-                total_agents=cfg.world.num_agents + cumulative_births,
+                total_agents=config.world.num_agents + cumulative_births,
                 actions_completed=formatter.stats.actions_completed + turn_stats["actions_completed"],
                 actions_failed=formatter.stats.actions_failed + turn_stats["actions_failed"],
                 social_interactions=formatter.stats.social_interactions + turn_stats["social_interactions"],
@@ -197,10 +199,10 @@ async def run_simulation_from_config(
                 agent_deaths=cumulative_deaths,
             )
 
-            if cfg.runtime.show_map_every > 0 and (t + 1) % cfg.runtime.show_map_every == 0:
+            if runtime_cfg.show_map_every > 0 and (t + 1) % runtime_cfg.show_map_every == 0:
                 world.show_map()
 
-            if cfg.output.get("show_agent_status", True) and (t + 1) % 5 == 0:
+            if output_cfg.show_agent_status and (t + 1) % 5 == 0:
                 print(formatter.format_header("AGENT STATUS", 3))
                 agent_data = []
                 for agent in world.agents:
@@ -216,7 +218,7 @@ async def run_simulation_from_config(
                     )
                 print(formatter.format_agent_status_table(agent_data))
 
-            if cfg.runtime.show_conversations:
+            if runtime_cfg.show_conversations:
                 conversations = world.get_conversations()
                 if conversations:
                     print(formatter.format_header("AGENT CONVERSATIONS", 3))
@@ -251,6 +253,8 @@ async def run_simulation_from_config(
             print(formatter.format_world_event(f"Failed to export web data: {e}", "error"))
 
         if monitor:
+            # The last turn's export is written by a background thread
+            await asyncio.to_thread(monitor.flush_exports)
             final_state = "stopped" if monitor.should_stop() else "completed"
             monitor.detach_world()
             monitor.clear_stop_request()
@@ -0,0 +1,163 @@
+"""Codec helpers behind the web monitor's per-turn snapshot.
+
+Plain functions used by ``SimulationMonitor.update_world_data`` to read
+agent fields, detect changes and flatten/pack the world grids.
+"""
+
+import base64
+from itertools import chain
+from operator import attrgetter
+from typing import Any, Dict, List, Tuple
+
+# Fields every `Agent` defines; other agent types fall back to getattr defaults
+_AGENT_FIELDS = attrgetter(
+    "aid", "name", "pos", "health", "inventory", "skills", "group_id", "reputation",
+    "social_connections", "memory",
+)
+
+
+def agent_fields(agent: Any) -> Tuple[Any, ...]:
+    """Read the monitored agent fields in one call, with defaults if missing."""
+    try:
+        return _AGENT_FIELDS(agent)
+    except AttributeError:
+        return (
+            agent.aid,
+            agent.name,
+            getattr(agent, 'pos', None),
+            getattr(agent, 'health', 100),
+            getattr(agent, 'inventory', None),
+            getattr(agent, 'skills', None),
+            getattr(agent, 'group_id', None),
+            getattr(agent, 'reputation', 0),
+            getattr(agent, 'social_connections', None),
+            getattr(agent, 'memory', None),
+        )
+
+
+def freeze(value: Any) -> Any:
+    """Immutable copy of nested dicts/lists, for change detection."""
+    if isinstance(value, dict):
+        return tuple((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def size_marker(value: Any) -> int:
+    """Size of a list/dict-of-lists/memory store, used to detect additions."""
+    if value is None:
+        return 0
+    if isinstance(value, dict):
+        return sum(len(v) if hasattr(v, '__len__') else 1 for v in value.values())
+    if hasattr(value, 'memories'):
+        value = value.memories
+    try:
+        return len(value)
+    except TypeError:
+        return -1
+
+
+def _connection_state(conn: Any) -> Tuple[Any, Any]:
+    if isinstance(conn, dict):
+        return conn.get("strength"), conn.get("relationship_type")
+    return getattr(conn, "strength", None), getattr(conn, "relationship_type", None)
+
+
+def connections_marker(value: Any) -> Any:
+    """Each connection's strength and relationship type, to detect edits."""
+    if isinstance(value, dict):
+        return tuple((k, _connection_state(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple((getattr(c, "target_id", None), _connection_state(c)) for c in value)
+    return size_marker(value)
+
+
+def _newest(items: Any) -> Any:
+    try:
+        return freeze(items[-1]) if items else None
+    except (TypeError, KeyError, IndexError):
+        return None
+
+
+def memory_marker(value: Any) -> Any:
+    """Size plus the newest entry (per category), so capped lists that
+    rotate at a constant size still register as changed."""
+    if hasattr(value, "memories"):
+        value = value.memories
+    if isinstance(value, dict):
+        return tuple((k, size_marker(v), _newest(v)) for k, v in value.items())
+    return size_marker(value), _newest(value)
+
+
+def flatten_terrain(world: Any) -> List[str]:
+    """Serialize terrain in row-major order (index = y * size + x).
+
+    Reads the 2D `world.map` (indexed `map[x][y]`) from the modern World
+    implementation, or the dict `world.terrain` keyed by `(x, y)` from the
+    simple runner. Missing tiles default to GRASSLAND.
+    """
+    size: int = world.size
+    grid = getattr(world, "map", None)
+    if grid is not None:
+        try:
+            if len(grid) == size and all(len(column) == size for column in grid):
+                # zip(*grid) transposes the x-major map into rows in C
+                return list(chain.from_iterable(zip(*grid)))
+        except TypeError:
+            pass
+        # Ragged or non-sequence map: fall back to per-tile access
+        out: List[str] = []
+        for y in range(size):
+            for x in range(size):
+                try:
+                    out.append(grid[x][y])
+                except Exception:
+                    out.append("GRASSLAND")
+        return out
+
+    out = ["GRASSLAND"] * (size * size)
+    terr = getattr(world, "terrain", None)
+    if isinstance(terr, dict):
+        # Scatter known tiles instead of probing every (x, y) key
+        for (tx, ty), kind in terr.items():
+            if 0 <= tx < size and 0 <= ty < size:
+                out[ty * size + tx] = kind
+    return out
+
+
+def flatten_resources(world: Any) -> Tuple[List[Dict[str, int]], int]:
+    """Serialize resource data from dict keyed by (x,y) in row-major order.
+
+    Only populated tiles are visited; empty tiles share one empty dict.
+    The world stats total is summed in the same pass.
+    """
+    size: int = world.size
+    empty: Dict[str, int] = {}
+    resources: List[Dict[str, int]] = [empty] * (size * size)
+    total = 0
+    wr = getattr(world, "resources", None) or {}
+    for (x, y), tile in wr.items():
+        if not tile:
+            continue
+        total += sum(tile.values())
+        if 0 <= x < size and 0 <= y < size:
+            resources[y * size + x] = dict(tile)
+    return resources, total
+
+
+def pack_terrain(cells: List[str]) -> Dict[str, Any]:
+    """Return base64 `terrain_codes` indexing into `terrain_legend`.
+
+    Clients decode `terrain_legend[code]` per tile in row-major order.
+    Falls back to the plain `terrain` list if codes do not fit a byte.
+    """
+    legend = sorted(set(cells), key=str)
+    if len(legend) > 256:
+        return {"terrain": cells}
+    index = {kind: code for code, kind in enumerate(legend)}
+    codes = bytes(map(index.__getitem__, cells))
+    return {
+        "terrain_codes": base64.b64encode(codes).decode("ascii"),
+        "terrain_legend": legend,
+    }
@@ -9,6 +9,7 @@
 
 import json
 import yaml
+from collections import Counter
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from pathlib import Path
@@ -443,14 +444,10 @@ Please respond concisely:""",
         stats = {
             "total_templates": len(self.templates),
             "json_templates": sum(1 for t in self.templates.values() if t.json_mode),
-            "categories": {}
+            # 按前缀分类统计（Counter.update 在 C 层完成逐项计数）
+            "categories": dict(Counter(name.split('_', 1)[0] for name in self.templates)),
         }
         
-        # 按前缀分类统计
-        for name in self.templates.keys():
-            prefix = name.split('_')[0]
-            stats["categories"][prefix] = stats["categories"].get(prefix, 0) + 1
-        
         return stats
 
 
@@ -0,0 +1,68 @@
+"""JSON encoding helpers shared by the web export and monitoring paths.
+
+``orjson`` is used when installed (``pip install genesis[speedups]``); the
+stdlib ``json`` module is the fallback. Both paths return UTF-8 ``bytes`` so
+callers can write files in binary mode and reuse one buffer per broadcast.
+``packb`` encodes MessagePack for clients that opt into it and requires the
+optional ``msgpack`` package.
+"""
+
+import json
+from collections import deque
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+HAS_ORJSON = orjson is not None
+HAS_MSGPACK = msgpack is not None
+
+
+def _default(obj: Any) -> Any:
+    """Encode container types that neither backend handles natively."""
+    if isinstance(obj, (deque, set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, Path):
+        return str(obj)
+    if hasattr(obj, "tolist"):
+        # NumPy arrays and scalars
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes (compact unless ``indent``)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    if indent:
+        text = json.dumps(obj, ensure_ascii=False, indent=2, default=_default)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default)
+    return text.encode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Parse JSON from ``bytes`` or ``str``."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    return json.loads(data)
+
+
+def packb(obj: Any) -> bytes:
+    """Serialize ``obj`` to MessagePack; ``bytes`` values stay binary."""
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(obj, default=_default, use_bin_type=True)
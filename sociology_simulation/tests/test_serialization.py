@@ -0,0 +1,20 @@
+"""Tests for the shared JSON encoding helpers."""
+from collections import deque
+
+from sociology_simulation import serialization
+from sociology_simulation.serialization import dumps, loads
+
+
+def test_dumps_returns_utf8_bytes_and_round_trips():
+    data = {"era": "石器时代", "turn": 3, "logs": deque([{"level": "INFO"}], maxlen=5)}
+    payload = dumps(data)
+    assert isinstance(payload, bytes)
+    assert "石器时代".encode("utf-8") in payload
+    assert loads(payload) == {"era": "石器时代", "turn": 3, "logs": [{"level": "INFO"}]}
+
+
+def test_stdlib_fallback_matches(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+    data = {"terrain": ("GRASSLAND", "FOREST"), "size": 2}
+    assert loads(dumps(data)) == {"terrain": ["GRASSLAND", "FOREST"], "size": 2}
+    assert dumps(data, indent=True).startswith(b"{\n  ")
@@ -0,0 +1,49 @@
+"""Tests for the incremental web data exporter."""
+import json
+from types import SimpleNamespace
+
+from sociology_simulation.web_export import WebDataExporter
+
+
+def _agent(aid):
+    return SimpleNamespace(
+        aid=aid, name=f"A{aid}", pos=(0, 0), age=20, health=100, hunger=0,
+        attributes={}, inventory={}, goal="", log=["idle"], memory={},
+    )
+
+
+def test_incremental_export_writes_only_new_turns_and_manifest(tmp_path):
+    exporter = WebDataExporter(str(tmp_path), max_retained_turns=3)
+    exporter.export_every = 2
+    exporter.initialize_export(2, "era", 1, ["GRASSLAND"], {})
+    exporter.save_world_state([["GRASSLAND"] * 2] * 2, {(0, 1): {"wood": 1}})
+
+    for turn in range(1, 7):
+        exporter.save_turn_data(turn, [_agent(1)], [], [], [])
+        exporter.export_incremental(turn)
+
+    chunk = json.loads((tmp_path / "simulation_turn_004.json").read_text())
+    assert [t["turn"] for t in chunk["turns"]] == [3, 4]
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert [entry["turn"] for entry in manifest["turns"]] == [2, 4, 6]
+    meta = json.loads((tmp_path / manifest["world_meta"]).read_text())
+    assert meta["world"]["resources"] == {"0,1": {"wood": 1}}
+
+    assert [t["turn"] for t in exporter.current_export["turns"]] == [4, 5, 6]
+
+
+def test_exporter_does_not_rewrite_files_linked_by_the_monitor(tmp_path):
+    from sociology_simulation.web_monitor import SimulationMonitor
+
+    monitor = SimulationMonitor(str(tmp_path))
+    monitor._write_export(4, b'{"turn":4}')
+
+    exporter = WebDataExporter(str(tmp_path))
+    exporter.export_every = 2
+    exporter.save_turn_data(4, [_agent(1)], [], [], [])
+    exporter.export_incremental(4)
+
+    assert (tmp_path / "latest.json").read_bytes() == b'{"turn":4}'
+    assert json.loads((tmp_path / "simulation_turn_004.json").read_text())["current_turn"] == 4
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,859 @@
+"""Tests for SimulationMonitor serialization and broadcast helpers."""
+from types import SimpleNamespace
+
+import pytest
+
+from sociology_simulation.web_monitor import SimulationMonitor
+
+
+@pytest.fixture
+def monitor(tmp_path):
+    return SimulationMonitor(str(tmp_path))
+
+
+def test_serialize_terrain_and_resources_are_row_major(monitor):
+    size = 4
+    grid = [[f"T{x}{y}" for y in range(size)] for x in range(size)]
+    world = SimpleNamespace(size=size, map=grid, resources={(3, 1): {"wood": 2}})
+
+    terrain = monitor._serialize_terrain(world)
+    resources = monitor._serialize_resources(world)
+
+    assert terrain == [grid[x][y] for y in range(size) for x in range(size)]
+    assert resources[1 * size + 3] == {"wood": 2}
+    assert sum(1 for tile in resources if tile) == 1
+
+
+def test_serialize_terrain_dict_fallback(monitor):
+    world = SimpleNamespace(size=3, terrain={(1, 2): "FOREST"})
+    terrain = monitor._serialize_terrain(world)
+    assert terrain[2 * 3 + 1] == "FOREST"
+    assert terrain.count("GRASSLAND") == 8
+
+
+def test_grid_serialization_is_cached_by_world_version(monitor):
+    world = SimpleNamespace(
+        size=2,
+        map=[["GRASSLAND", "FOREST"], ["WATER", "GRASSLAND"]],
+        resources={(0, 0): {"wood": 1}},
+        terrain_version=1,
+        resources_version=1,
+    )
+    terrain = monitor._serialize_terrain(world)
+    resources = monitor._serialize_resources(world)
+    assert monitor._serialize_terrain(world) is terrain
+    assert monitor._serialize_resources(world) is resources
+
+    world.resources[(0, 0)]["wood"] = 0
+    world.resources_version += 1
+    assert monitor._serialize_resources(world)[0] == {"wood": 0}
+    assert monitor._serialize_terrain(world) is terrain
+
+
+def test_diff_snapshot_sends_only_changed_agents_and_world_fields(monitor):
+    terrain = ["GRASSLAND"] * 4
+    first = monitor._diff_snapshot(
+        {"size": 2, "turn": 1, "terrain": terrain},
+        [{"aid": 1, "x": 0}, {"aid": 2, "x": 1}],
+        1,
+    )
+    assert set(first["world"]) == {"size", "turn", "terrain"}
+    assert len(first["agents"]["updated"]) == 2
+
+    second = monitor._diff_snapshot(
+        {"size": 2, "turn": 2, "terrain": terrain},
+        [{"aid": 1, "x": 1}],
+        2,
+    )
+    assert second["world"] == {"turn": 2}
+    assert second["agents"] == {"updated": [{"aid": 1, "x": 1}], "removed": [2]}
+
+
+@pytest.mark.asyncio
+async def test_slow_client_backlog_is_replaced_by_snapshot_resync(monitor):
+    from sociology_simulation import web_monitor
+
+    channel = web_monitor._ClientChannel(websocket=object(), maxsize=2)
+    monitor._client_channels[channel.websocket] = channel
+
+    for turn in range(5):
+        monitor._broadcast_message({"type": "simulation_delta", "data": {"turn": turn}})
+
+    queued = [channel.queue.get_nowait() for _ in range(channel.queue.qsize())]
+    assert queued[0] is web_monitor._RESYNC
+    assert len(queued) <= 2
+
+
+@pytest.mark.asyncio
+async def test_stalled_client_is_disconnected_after_send_timeout(monitor):
+    import asyncio
+    from sociology_simulation import web_monitor
+
+    class StalledSocket:
+        closed = False
+
+        async def send(self, payload, text=None):
+            await asyncio.sleep(10)
+
+        async def close(self):
+            self.closed = True
+
+    websocket = StalledSocket()
+    channel = web_monitor._ClientChannel(websocket=websocket, maxsize=2)
+    monitor._client_channels[websocket] = channel
+    monitor.websocket_clients.add(websocket)
+    monitor.client_send_timeout = 0.01
+    channel.queue.put_nowait(b"{}")
+
+    await asyncio.wait_for(monitor._client_writer(channel), 1)
+
+    assert websocket.closed
+    assert websocket not in monitor.websocket_clients
+
+
+def test_deflate_clients_share_one_compressed_payload(monitor):
+    import zlib
+    from sociology_simulation import web_monitor
+
+    class Socket:
+        def __init__(self, subprotocol):
+            self.subprotocol = subprotocol
+
+    channels = [
+        web_monitor._ClientChannel(Socket(subprotocol), maxsize=2)
+        for subprotocol in ("genesis.deflate", "genesis.deflate", None)
+    ]
+    for channel in channels:
+        monitor._client_channels[channel.websocket] = channel
+
+    monitor._broadcast_message({"type": "logs_batch", "data": []})
+
+    first, second, plain = (channel.queue.get_nowait() for channel in channels)
+    assert first is second
+    assert channels[0].binary
+    assert zlib.decompress(first) == plain
+
+
+@pytest.mark.asyncio
+async def test_log_entries_are_flushed_as_one_batch(monitor):
+    sent = []
+
+    def capture(message):
+        sent.append(message)
+
+    monitor._broadcast_message = capture
+    monitor.websocket_clients.add(object())
+    for i in range(3):
+        monitor.add_log_entry("info", f"line {i}")
+
+    monitor._flush_logs()
+    monitor._flush_logs()
+
+    assert len(sent) == 1
+    assert sent[0]["type"] == "logs_batch"
+    assert [e["message"] for e in sent[0]["data"]] == ["line 0", "line 1", "line 2"]
+
+
+@pytest.mark.asyncio
+async def test_log_flush_is_debounced_and_triggered_by_batch_size(monitor):
+    import asyncio
+
+    sent = []
+    monitor._broadcast_message = lambda message: sent.append(len(message["data"]))
+    monitor._loop = asyncio.get_running_loop()
+    monitor.websocket_clients.add(object())
+    monitor.log_flush_interval = 0.02
+    monitor.log_batch_size = 4
+
+    for i in range(3):
+        monitor.add_log_entry("info", f"line {i}")
+    await asyncio.sleep(0)
+    assert sent == []
+    await asyncio.sleep(0.05)
+    assert sent == [3]
+
+    for i in range(4):
+        monitor.add_log_entry("info", f"line {i}")
+    await asyncio.sleep(0)
+    assert sent == [3, 4]
+
+
+def test_a_log_flood_schedules_one_immediate_flush(monitor):
+    scheduled = []
+    monitor._schedule = lambda callback, *args: scheduled.append(callback)
+    monitor.websocket_clients.add(object())
+    monitor._broadcast_message = lambda message: None
+    monitor.log_batch_size = 10
+
+    for i in range(3 * monitor.log_batch_size):
+        monitor.add_log_entry("info", f"line {i}")
+
+    assert scheduled.count(monitor._flush_logs) == 1
+    monitor._flush_logs()
+    monitor.add_log_entry("info", "after flush")
+    assert scheduled.count(monitor._flush_logs) == 1
+    for i in range(monitor.log_batch_size):
+        monitor.add_log_entry("info", f"line {i}")
+    assert scheduled.count(monitor._flush_logs) == 2
+
+
+def test_logs_are_bounded_and_recent_logs_are_oldest_first(monitor):
+    for i in range(monitor.max_log_entries + 5):
+        monitor.add_log_entry("info", f"line {i}")
+
+    assert len(monitor.current_data["logs"]) == monitor.max_log_entries
+    recent = monitor._recent_logs(3)
+    assert [e["message"] for e in recent] == [
+        f"line {monitor.max_log_entries + i}" for i in (2, 3, 4)
+    ]
+
+
+def test_unchanged_agents_reuse_their_dict_across_turns(monitor):
+    world = SimpleNamespace(size=2, map=[["GRASSLAND"] * 2] * 2, resources={})
+    agents = [
+        SimpleNamespace(aid=i, name=f"A{i}", pos=(0, i), health=100, inventory={"wood": 1})
+        for i in range(2)
+    ]
+    deltas = []
+    diff = monitor._diff_snapshot
+    monitor._diff_snapshot = lambda *args: deltas.append(diff(*args)) or deltas[-1]
+
+    monitor.update_world_data(world, agents, 1)
+    first = monitor.current_data["agents"]
+    agents[1].inventory["wood"] = 2
+    monitor.update_world_data(world, agents, 2)
+
+    assert monitor.current_data["agents"][0] is first[0]
+    assert monitor.current_data["agents"][1]["inventory"] == {"wood": 2}
+    assert [a["aid"] for a in deltas[1]["agents"]["updated"]] == [1]
+
+
+def test_action_events_are_emitted_only_when_an_action_changes(monitor):
+    world = SimpleNamespace(size=2, map=[["GRASSLAND"] * 2] * 2, resources={})
+    agents = [
+        SimpleNamespace(aid=i, name=f"A{i}", pos=(0, i), health=100, current_action="rest")
+        for i in range(2)
+    ]
+
+    monitor.update_world_data(world, agents, 1)
+    agents[1].current_action = "gather wood"
+    monitor.update_world_data(world, agents, 2)
+    monitor.update_world_data(world, agents, 3)
+
+    actions = monitor.current_data["actions"]
+    assert [(a["aid"], a["action"], a["turn"]) for a in actions] == [
+        (0, "rest", 1), (1, "rest", 1), (1, "gather wood", 2),
+    ]
+
+
+def test_action_buffer_keeps_the_most_recent_events(monitor):
+    from collections import deque
+
+    monitor._actions = monitor.current_data["actions"] = deque(maxlen=3)
+    world = SimpleNamespace(size=2, map=[["GRASSLAND"] * 2] * 2, resources={})
+    agent = SimpleNamespace(aid=1, name="A1", pos=(0, 0), health=100)
+
+    for turn in range(1, 6):
+        agent.current_action = f"step {turn}"
+        monitor.update_world_data(world, [agent], turn)
+
+    assert [a["turn"] for a in monitor.current_data["actions"]] == [3, 4, 5]
+
+
+def test_encode_terrain_round_trips_through_legend(monitor):
+    import base64
+
+    size = 3
+    grid = [["FOREST", "OCEAN", "GRASSLAND"] for _ in range(size)]
+    world = SimpleNamespace(size=size, map=grid, terrain_version=0)
+
+    packed = monitor._encode_terrain(world)
+    codes = base64.b64decode(packed["terrain_codes"])
+    decoded = [packed["terrain_legend"][code] for code in codes]
+
+    assert decoded == monitor._serialize_terrain(world)
+    assert monitor._encode_terrain(world) is packed
+
+
+def test_queued_exports_are_written_by_background_thread(monitor, tmp_path):
+    import json
+    import time
+
+    monitor.current_data["turn"] = 7
+    monitor._queue_export()
+
+    latest = tmp_path / "latest.json"
+    deadline = time.monotonic() + 5
+    while not latest.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert json.loads(latest.read_text())["turn"] == 7
+    assert (tmp_path / "simulation_turn_007.json").exists()
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_flush_exports_writes_the_pending_export_and_stops_the_writer(monitor, tmp_path):
+    import json
+
+    monitor.current_data["turn"] = 8
+    monitor._queue_export()
+    writer = monitor._export_thread
+    monitor.flush_exports()
+
+    assert json.loads((tmp_path / "latest.json").read_text())["turn"] == 8
+    assert not writer.is_alive() and monitor._export_thread is None
+
+    monitor.current_data["turn"] = 9
+    monitor._data_version += 1
+    monitor._queue_export()
+    monitor.flush_exports()
+    assert json.loads((tmp_path / "latest.json").read_text())["turn"] == 9
+
+
+def test_latest_json_shares_the_turn_file(monitor, tmp_path):
+    import os
+
+    monitor._write_export(3, b'{"turn":3}')
+    monitor._write_export(4, b'{"turn":4}')
+
+    latest = tmp_path / "latest.json"
+    assert latest.read_bytes() == b'{"turn":4}'
+    assert os.path.samefile(latest, tmp_path / "simulation_turn_004.json")
+    assert (tmp_path / "simulation_turn_003.json").read_bytes() == b'{"turn":3}'
+
+
+def test_unchanged_snapshot_is_not_exported_twice(monitor, tmp_path):
+    monitor.add_log_entry("info", "ready")
+    monitor._export_to_file()
+    exported = tmp_path / "simulation_turn_000.json"
+    exported.unlink()
+
+    monitor._export_to_file()
+    assert not exported.exists()
+
+    monitor.add_log_entry("info", "changed")
+    monitor._export_to_file()
+    assert exported.exists()
+
+
+def test_nested_agent_edits_are_detected(monitor):
+    from sociology_simulation.agent import Agent
+
+    world = SimpleNamespace(size=2, map=[["GRASSLAND"] * 2] * 2, resources={})
+    agent = Agent(aid=1, pos=(0, 0), attributes={}, inventory={}, name="A1")
+    agent.skills["foraging"] = {"level": 1}
+    monitor.update_world_data(world, [agent], 1)
+
+    agent.skills["foraging"]["level"] = 2
+    agent.reputation["brave"] += 1
+    monitor.update_world_data(world, [agent], 2)
+
+    info = monitor.current_data["agents"][0]
+    assert info["skills"]["foraging"]["level"] == 2
+    assert info["reputation"]["brave"] == 1
+    assert info["skills"]["foraging"] is not agent.skills["foraging"]
+
+
+def test_same_size_connection_and_memory_edits_are_detected(monitor):
+    world = SimpleNamespace(size=2, map=[["GRASSLAND"] * 2] * 2, resources={})
+    agent = SimpleNamespace(
+        aid=1, name="A1", pos=(0, 0), health=100,
+        social_connections={2: {"strength": 0.5, "relationship_type": "friend"}},
+        memory=[f"event {i}" for i in range(5)],
+    )
+    monitor.update_world_data(world, [agent], 1)
+
+    agent.social_connections[2]["strength"] = 0.9
+    agent.memory.pop(0)
+    agent.memory.append("event 5")  # capped list rotated at the same size
+    monitor.update_world_data(world, [agent], 2)
+
+    info = monitor.current_data["agents"][0]
+    assert info["social_connections"][0]["strength"] == 0.9
+    assert info["memory"][-1] == "event 5"
+
+
+def test_exports_can_be_gzipped(monitor, tmp_path):
+    import gzip
+
+    monitor.export_compresslevel = 1
+    monitor._write_export(2, b'{"turn":2}')
+
+    assert gzip.decompress((tmp_path / "latest.json.gz").read_bytes()) == b'{"turn":2}'
+    assert (tmp_path / "simulation_turn_002.json.gz").exists()
+    assert not (tmp_path / "latest.json").exists()
+
+
+def test_world_stats_reuse_resource_and_agent_counts(monitor):
+    world = SimpleNamespace(
+        size=2, map=[["GRASSLAND"] * 2] * 2, resources={(0, 0): {"wood": 2, "stone": 1}, (1, 1): {"fish": 4}}
+    )
+    agents = [
+        SimpleNamespace(aid=1, name="A1", pos=(0, 0), current_action="gather"),
+        SimpleNamespace(aid=2, name="A2", pos=(1, 1), current_action=None),
+    ]
+
+    monitor.update_world_data(world, agents, 1)
+
+    stats = monitor.current_data["world"]["stats"]
+    assert stats["total_resources"] == 7
+    assert stats["active_agents"] == 1
+    assert monitor._calculate_world_stats(world, agents) == stats
+
+
+def test_snapshot_bytes_are_reused_until_data_changes(monitor):
+    import json
+
+    first = monitor._snapshot_bytes()
+    assert monitor._snapshot_bytes() is first
+
+    monitor.add_log_entry("info", "hello")
+    second = monitor._snapshot_bytes()
+    assert second is not first
+    assert json.loads(second)["logs"][-1]["message"] == "hello"
+
+    message = json.loads(monitor._snapshot_payload())
+    assert message["type"] == "simulation_update"
+    assert message["data"] == json.loads(second)
+
+
+@pytest.mark.asyncio
+async def test_broadcasts_from_another_thread_reach_the_server_loop(monitor):
+    import asyncio
+    import threading
+
+    sent = []
+
+    def capture(message):
+        sent.append((message["type"], threading.get_ident()))
+
+    monitor._broadcast_message = capture
+    monitor._loop = asyncio.get_running_loop()
+    monitor.websocket_clients.add(object())
+    world = SimpleNamespace(size=2, map=[["GRASSLAND"] * 2] * 2, resources={})
+    agents = [SimpleNamespace(aid=1, name="A1", pos=(0, 0))]
+
+    worker = threading.Thread(target=monitor.update_world_data, args=(world, agents, 1))
+    worker.start()
+    await asyncio.to_thread(worker.join)
+    await asyncio.sleep(0.05)
+
+    assert sent == [("simulation_delta", threading.get_ident())]
+
+
+@pytest.mark.asyncio
+async def test_keyframe_turns_resync_clients_instead_of_sending_a_delta(monitor):
+    import asyncio
+    import json
+    from sociology_simulation import web_monitor
+
+    channel = web_monitor._ClientChannel(websocket=object(), maxsize=8)
+    monitor._client_channels[channel.websocket] = channel
+    monitor.websocket_clients.add(channel.websocket)
+    monitor._loop = asyncio.get_running_loop()
+    monitor.keyframe_interval = 2
+    world = SimpleNamespace(size=2, map=[["GRASSLAND"] * 2] * 2, resources={})
+    agents = [SimpleNamespace(aid=1, name="A1", pos=(0, 0))]
+
+    for turn in (1, 2):
+        monitor.update_world_data(world, agents, turn)
+    await asyncio.sleep(0)
+
+    queued = [channel.queue.get_nowait() for _ in range(channel.queue.qsize())]
+    assert len(queued) == 2
+    assert json.loads(queued[0])["type"] == "simulation_delta"
+    assert queued[1] is web_monitor._RESYNC
+
+
+def test_update_is_skipped_without_consumers(monitor):
+    world = SimpleNamespace(size=2, map=[["GRASSLAND"] * 2] * 2, resources={})
+    agents = [SimpleNamespace(aid=1, name="A1", pos=(0, 0))]
+    monitor.export_interval = 0
+
+    monitor.update_world_data(world, agents, 1)
+    assert monitor.current_data["world"] is None
+    assert monitor.get_simulation_status()["turn"] == 1
+
+    monitor._api_hit_recently = True
+    monitor.update_world_data(world, agents, 2)
+    assert monitor.current_data["turn"] == 2
+    assert monitor._api_hit_recently is False
+
+
+def test_nothing_is_scheduled_for_broadcast_without_clients(monitor):
+    scheduled = []
+    monitor._schedule = lambda callback, *args: scheduled.append(callback)
+    world = SimpleNamespace(size=2, map=[["GRASSLAND"] * 2] * 2, resources={})
+    agents = [SimpleNamespace(aid=1, name="A1", pos=(0, 0), current_action="rest")]
+    monitor._api_hit_recently = True
+
+    monitor.update_world_data(world, agents, 1)
+    monitor.add_log_entry("info", "New market established at (1, 1): market_1")
+
+    assert monitor.current_data["actions"] and monitor.current_data["structures"]
+    assert scheduled == []
+
+
+def test_first_update_after_skipped_turns_starts_from_a_fresh_baseline(monitor):
+    world = SimpleNamespace(size=2, map=[["GRASSLAND"] * 2] * 2, resources={})
+    agents = [
+        SimpleNamespace(aid=i, name=f"A{i}", pos=(0, i), health=100, current_action="rest")
+        for i in range(2)
+    ]
+    deltas = []
+    diff = monitor._diff_snapshot
+    monitor._diff_snapshot = lambda *args: deltas.append(diff(*args)) or deltas[-1]
+    monitor.export_interval = 0
+
+    monitor._api_hit_recently = True
+    monitor.update_world_data(world, agents, 1)
+    agents[0].current_action = "gather wood"
+    monitor.update_world_data(world, agents, 2)  # skipped: nobody is watching
+    monitor._api_hit_recently = True
+    monitor.update_world_data(world, agents, 3)
+
+    assert [a["turn"] for a in monitor.current_data["actions"]] == [1, 1]
+    assert len(deltas[-1]["agents"]["updated"]) == 2
+    assert "size" in deltas[-1]["world"]
+
+    agents[1].current_action = "hunt"
+    monitor._api_hit_recently = True
+    monitor.update_world_data(world, agents, 4)
+    assert [(a["aid"], a["turn"]) for a in monitor.current_data["actions"]][-1] == (1, 4)
+    assert [a["aid"] for a in deltas[-1]["agents"]["updated"]] == [1]
+
+
+def test_msgpack_snapshot_carries_raw_terrain_bytes(monitor):
+    msgpack = pytest.importorskip("msgpack")
+    import base64
+
+    world = SimpleNamespace(size=2, map=[["FOREST", "OCEAN"]] * 2, resources={})
+    monitor.update_world_data(world, [], 1)
+
+    message = msgpack.unpackb(monitor._snapshot_msgpack())
+    codes = message["data"]["world"]["terrain_codes"]
+    assert message["type"] == "simulation_update"
+    assert codes == base64.b64decode(monitor.current_data["world"]["terrain_codes"])
+    # The JSON snapshot keeps its base64 text
+    assert isinstance(monitor.current_data["world"]["terrain_codes"], str)
+
+
+@pytest.mark.asyncio
+async def test_api_responses_are_json(monitor):
+    from aiohttp.test_utils import TestClient, TestServer
+
+    monitor.add_log_entry("info", "ready")
+    async with TestClient(TestServer(monitor.setup_http_server())) as client:
+        resp = await client.get("/api/logs?limit=1")
+        assert resp.status == 200
+        assert resp.content_type == "application/json"
+        assert (await resp.json())["logs"][0]["message"] == "ready"
+
+        resp = await client.post("/api/interactions", json={})
+        assert resp.status == 400
+        assert "error" in await resp.json()
+
+        monitor.attach_world(object())
+        resp = await client.post("/api/interactions", data=b"{not json",
+                                 headers={"Content-Type": "application/json"})
+        assert resp.status == 400
+        assert (await resp.json())["error"] == "Invalid JSON payload"
+
+
+@pytest.mark.asyncio
+async def test_interactions_are_routed_by_role_and_action(monitor):
+    from aiohttp.test_utils import TestClient, TestServer
+
+    world = SimpleNamespace(
+        pending_interactions=[], agents=[], trinity=SimpleNamespace(era_prompt="old")
+    )
+    monitor.attach_world(world)
+    async with TestClient(TestServer(monitor.setup_http_server())) as client:
+        async def post(payload):
+            resp = await client.post("/api/interactions", json=payload)
+            return resp.status, await resp.json()
+
+        status, body = await post({"agent_id": 1, "target_id": 2, "content": "hi"})
+        assert (status, body["status"]) == (200, "queued")
+        assert world.pending_interactions[0]["source_id"] == 1
+
+        status, body = await post({"agent_id": "1", "target_id": True, "content": "hi"})
+        assert (status, body["error"]) == (400, "agent_id and target_id must be integers")
+
+        status, body = await post({"role": "trinity", "content": "hi", "targets": [1, 2.5]})
+        assert (status, body["error"]) == (400, "targets must be integers")
+
+        status, body = await post({"role": "trinity", "action": "set_era", "era": "bronze"})
+        assert (status, world.trinity.era_prompt) == (200, "bronze")
+
+        status, body = await post({"role": "trinity", "action": "flood"})
+        assert (status, body["error"]) == (400, "Unknown Trinity action 'flood'")
+
+        status, body = await post({"role": ["agent"]})
+        assert (status, body["error"]) == (400, "Unknown role '['agent']'")
+
+
+@pytest.mark.asyncio
+async def test_interactions_are_applied_on_the_simulation_loop(monitor):
+    import asyncio
+    import threading
+    import time
+    from aiohttp.test_utils import TestClient, TestServer
+
+    class Recorder(list):
+        def append(self, item):
+            super().append((item["content"], threading.get_ident()))
+
+    sim_loop = asyncio.new_event_loop()
+    sim_thread = threading.Thread(target=sim_loop.run_forever, daemon=True)
+    sim_thread.start()
+    world = SimpleNamespace(pending_interactions=Recorder(), agents=[])
+
+    async def attach():
+        monitor.attach_world(world)
+
+    try:
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(attach(), sim_loop))
+        async with TestClient(TestServer(monitor.setup_http_server())) as client:
+            payload = {"agent_id": 1, "target_id": 2, "content": "hi"}
+            resp = await client.post("/api/interactions", json=payload)
+            assert resp.status == 200
+            assert list(world.pending_interactions) == [("hi", sim_thread.ident)]
+
+            # A simulation loop stuck in a turn: the request gives up, and
+            # the interaction is not applied later behind the caller's back
+            monitor.world_call_timeout = 0.05
+            sim_loop.call_soon_threadsafe(time.sleep, 0.3)
+            resp = await client.post("/api/interactions", json={**payload, "content": "late"})
+            assert resp.status == 503
+            await asyncio.sleep(0.4)
+            assert len(world.pending_interactions) == 1
+    finally:
+        sim_loop.call_soon_threadsafe(sim_loop.stop)
+        sim_thread.join(5)
+        sim_loop.close()
+
+
+@pytest.mark.asyncio
+async def test_data_api_answers_304_while_snapshot_is_unchanged(monitor):
+    from aiohttp.test_utils import TestClient, TestServer
+
+    async with TestClient(TestServer(monitor.setup_http_server())) as client:
+        resp = await client.get("/api/simulation-data")
+        etag = resp.headers["ETag"]
+        assert resp.status == 200
+
+        resp = await client.get("/api/simulation-data", headers={"If-None-Match": etag})
+        assert resp.status == 304
+
+        monitor.add_log_entry("info", "changed")
+        resp = await client.get("/api/simulation-data", headers={"If-None-Match": etag})
+        assert resp.status == 200
+        assert resp.headers["ETag"] != etag
+
+
+def test_composed_configs_are_cached_per_override_list(monitor, monkeypatch):
+    from sociology_simulation.web_monitor import MonitorSimulationController
+
+    controller = MonitorSimulationController(monitor)
+    composed = []
+    compose = controller._compose_uncached
+    monkeypatch.setattr(
+        controller, "_compose_uncached", lambda overrides: composed.append(overrides) or compose(overrides)
+    )
+
+    first = controller._compose_config(["runtime.turns=3"])
+    first.runtime.turns = 99
+    second = controller._compose_config(["runtime.turns=3"])
+
+    assert composed == [["runtime.turns=3"]]
+    assert second.runtime.turns == 3
+
+
+@pytest.mark.asyncio
+async def test_simulation_data_is_served_as_msgpack_when_accepted(monitor):
+    msgpack = pytest.importorskip("msgpack")
+    from aiohttp.test_utils import TestClient, TestServer
+
+    world = SimpleNamespace(size=2, map=[["FOREST", "OCEAN"]] * 2, resources={})
+    monitor.update_world_data(world, [], 1)
+    async with TestClient(TestServer(monitor.setup_http_server())) as client:
+        resp = await client.get("/api/simulation-data", headers={"Accept": "application/msgpack"})
+        assert resp.content_type == "application/msgpack"
+        data = msgpack.unpackb(await resp.read())
+        assert data["turn"] == 1
+        assert isinstance(data["world"]["terrain_codes"], bytes)
+
+        resp = await client.get("/api/simulation-data")
+        assert resp.content_type == "application/json"
+        assert resp.headers["Vary"] == "Accept"
+
+
+def test_background_web_servers_can_be_stopped():
+    from sociology_simulation import web_monitor
+
+    thread = web_monitor.start_web_servers("127.0.0.1", 0, 0)
+    assert web_monitor.start_web_servers("127.0.0.1", 0, 0) is thread
+    thread.stop()
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert web_monitor.get_monitor()._loop is None
+
+
+@pytest.mark.asyncio
+async def test_web_servers_can_share_the_callers_loop():
+    import asyncio
+    from sociology_simulation import web_monitor
+
+    shutdown = await web_monitor.start_web_servers_async("127.0.0.1", 0, 0)
+    try:
+        assert web_monitor.get_monitor()._loop is asyncio.get_running_loop()
+    finally:
+        await shutdown()
+    assert web_monitor.get_monitor()._loop is None
+
+
+@pytest.mark.asyncio
+async def test_status_api_answers_304_until_status_changes(monitor):
+    from aiohttp.test_utils import TestClient, TestServer
+
+    async with TestClient(TestServer(monitor.setup_http_server())) as client:
+        resp = await client.get("/api/simulation-status")
+        etag = resp.headers["ETag"]
+        assert (await resp.json())["status"]["state"] == "idle"
+
+        resp = await client.get("/api/simulation-status", headers={"If-None-Match": etag})
+        assert resp.status == 304
+
+        monitor.update_status(turn=3)
+        resp = await client.get("/api/simulation-status", headers={"If-None-Match": etag})
+        assert resp.status == 200
+
+
+@pytest.mark.asyncio
+async def test_static_assets_are_served_gzipped_from_memory(monitor, tmp_path):
+    import gzip
+    from aiohttp import web
+    from aiohttp.test_utils import TestClient, TestServer
+
+    asset = tmp_path / "index-abc123.js"
+    asset.write_text("console.log('monitor');\n" * 100)
+    app = web.Application()
+
+    async def serve(request):
+        return await monitor._serve_static_asset(request, asset, immutable=True)
+
+    app.router.add_get("/asset.js", serve)
+    async with TestClient(TestServer(app)) as client:
+        resp = await client.get("/asset.js", headers={"Accept-Encoding": "gzip"}, auto_decompress=False)
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert "immutable" in resp.headers["Cache-Control"]
+        assert gzip.decompress(await resp.read()) == asset.read_bytes()
+
+        asset.write_text("changed")  # already cached in memory
+        resp = await client.get("/asset.js", headers={"If-None-Match": resp.headers["ETag"]})
+        assert resp.status == 304
+
+
+def test_monitor_asset_spellings_share_one_cache_key(monitor, tmp_path):
+    from aiohttp import web
+
+    root = (tmp_path / "assets").resolve()
+    (root / "js").mkdir(parents=True)
+    (root / "js" / "app.js").write_text("app")
+    (tmp_path / "secret.txt").write_text("secret")
+
+    key = monitor._monitor_asset_path(root, "js/app.js")
+    monitor._static_cache[key] = monitor._load_static_asset(key)
+    for spelling in ("js/./app.js", "js//app.js", "css/../js/app.js"):
+        assert monitor._monitor_asset_path(root, spelling) == key
+
+    for escape in ("../secret.txt", "js/../../secret.txt", "missing.js"):
+        with pytest.raises(web.HTTPNotFound):
+            monitor._monitor_asset_path(root, escape)
+
+
+@pytest.mark.asyncio
+async def test_controller_runs_the_simulation_off_the_server_loop(monitor, monkeypatch):
+    import threading
+    from sociology_simulation import main
+    from sociology_simulation.web_monitor import MonitorSimulationController
+
+    threads = []
+
+    async def fake_run(cfg, monitor=None):
+        threads.append(threading.get_ident())
+
+    monkeypatch.setattr(main, "run_simulation_from_config", fake_run)
+    controller = MonitorSimulationController(monitor)
+    await controller._run(None)
+
+    assert threads and threads[0] != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_flush_waits_for_queued_messages_to_be_sent(monitor):
+    import asyncio
+    from sociology_simulation import web_monitor
+
+    sent = []
+
+    class Socket:
+        async def send(self, payload, text=None):
+            await asyncio.sleep(0.01)
+            sent.append(payload)
+
+    websocket = Socket()
+    channel = web_monitor._ClientChannel(websocket, maxsize=8)
+    monitor._client_channels[websocket] = channel
+    monitor.websocket_clients.add(websocket)
+    channel.task = asyncio.create_task(monitor._client_writer(channel))
+    monitor._broadcast_message({"type": "actions_update", "data": {"events": []}})
+    monitor._log_flush_buffer.append({"message": "finished"})
+
+    await monitor.flush(timeout=1)
+
+    assert len(sent) == 2
+    channel.task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_invalid_client_frames_do_not_end_the_connection(monitor):
+    import websockets.exceptions
+
+    frames = [b"\xff", b"{not json", b'{"type": "request_logs"}']
+
+    class Socket:
+        remote_address = ("127.0.0.1", 0)
+        subprotocol = None
+
+        async def recv(self, decode=None):
+            if not frames:
+                raise websockets.exceptions.ConnectionClosedOK(None, None)
+            return frames.pop(0)
+
+        async def send(self, payload, text=None):
+            pass
+
+    handled = []
+
+    async def record(websocket, data):
+        handled.append(data)
+
+    monitor._handle_websocket_message = record
+    await monitor.websocket_handler(Socket())
+
+    assert handled == [{"type": "request_logs"}]
+    assert not monitor.websocket_clients
+
+
+def test_structures_are_extracted_from_log_messages(monitor):
+    extract = monitor._maybe_extract_structure_from_message
+
+    assert extract("New market established at (7, 2): market_1") == {
+        "id": "market_1", "kind": "market", "name": "market_1", "x": 7, "y": 2,
+    }
+    assert extract("new settlement at (1, 3)")["id"] == "settlement_1_3"
+    assert extract("Agent 4 BUILT Hut at (3, 4)")["kind"] == "hut"
+    assert extract("Agent 4 gathered wood") is None
@@ -150,6 +150,7 @@ class Trinity:
                     x, y = pos[0], pos[1]
                     if 0 <= x < world.size and 0 <= y < world.size:
                         world.map[x][y] = data["adjust_terrain"]["new_terrain"]
+                world.terrain_version = getattr(world, "terrain_version", 0) + 1
                 logger.success(f"[Trinity] Adjusted terrain at {len(data['adjust_terrain']['positions'])} positions")
             recognized_update = True
         
@@ -228,6 +229,7 @@ class Trinity:
             return
         
         resources_to_regenerate = specific_resources if specific_resources else self.resource_rules.keys()
+        world.resources_version = getattr(world, "resources_version", 0) + 1
         
         for resource in resources_to_regenerate:
             if resource not in self.resource_rules:
@@ -263,6 +265,7 @@ class Trinity:
             for pos, resources in world.resources.items():
                 if "water" in resources:
                     resources["water"] = max(0, resources["water"] - 1)
+            world.resources_version = getattr(world, "resources_version", 0) + 1
         elif "abundance" in climate_type.lower():
             # Increase plant-related resources slightly
             self._regenerate_resources(world, 1.3, ["wood", "apple", "fruit"])
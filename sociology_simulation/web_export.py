@@ -3,23 +3,35 @@ Web UI data export functionality
 Saves world state, agents, and simulation data to JSON for web visualization
 """
 
-import json
 import os
+from collections import deque
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+from .serialization import dumps
+
 class WebDataExporter:
-    """Exports simulation data for web UI consumption"""
+    """Exports simulation data for web UI consumption
+
+    World metadata and terrain go to ``world_meta.json`` once; incremental
+    exports write only the turns saved since the previous export and list
+    them in ``manifest.json``. The full export keeps the last
+    ``max_retained_turns`` turns.
+    """
     
-    def __init__(self, output_dir: str = "web_data"):
+    def __init__(self, output_dir: str = "web_data", max_retained_turns: int = 20):
         self.output_dir = output_dir
+        self.max_retained_turns = max_retained_turns
         self.current_export = {
             'metadata': {},
             'world': {},
-            'turns': [],
+            'turns': deque(maxlen=max_retained_turns),
             'current_turn': 0
         }
+        # Turns saved since the last incremental export
+        self._pending_turns: List[Dict[str, Any]] = []
+        self._manifest: Dict[str, Any] = {'world_meta': 'world_meta.json', 'turns': []}
         # Throttling options (may be overridden by config in initialize_export)
         self.export_every: int = 5
         self.max_agent_log_entries: int = 5
@@ -64,6 +76,10 @@ class WebDataExporter:
             formatted_resources[key] = resource_dict
         
         self.current_export['world']['resources'] = formatted_resources
+        self._write_json('world_meta.json', {
+            'metadata': self.current_export['metadata'],
+            'world': self.current_export['world']
+        })
     
     def save_turn_data(self, turn_num: int, agents: List, conversations: List[str], 
                       events: List[str], turn_log: List[str]):
@@ -100,25 +116,46 @@ class WebDataExporter:
         
         self.current_export['turns'].append(turn_data)
         self.current_export['current_turn'] = turn_num
+        self._pending_turns.append(turn_data)
+    
+    def _write_json(self, filename: str, data: Any) -> str:
+        """Write ``data`` as indented JSON under the output directory
+
+        The file is swapped in with ``os.replace``, never truncated in place:
+        the web monitor shares this directory and hard-links ``latest.json``
+        to its own ``simulation_turn_*.json`` files.
+        """
+        filepath = os.path.join(self.output_dir, filename)
+        tmp_path = f"{filepath}.{os.getpid()}.tmp"
+        
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps(data, indent=True))
+        os.replace(tmp_path, filepath)
+        
+        return filepath
     
     def export_to_file(self, filename: Optional[str] = None):
-        """Export current data to JSON file"""
+        """Export metadata, world and the retained recent turns to JSON file"""
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"simulation_data_{timestamp}.json"
         
-        filepath = os.path.join(self.output_dir, filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.current_export, f, ensure_ascii=False, indent=2)
-        
-        return filepath
+        return self._write_json(filename, self.current_export)
     
     def export_incremental(self, turn_num: int):
-        """Export data incrementally (every few turns)"""
+        """Export the turns saved since the last export (every few turns)"""
         if self.export_every > 0 and turn_num % self.export_every == 0:
             filename = f"simulation_turn_{turn_num:03d}.json"
-            return self.export_to_file(filename)
+            filepath = self._write_json(filename, {
+                'current_turn': turn_num,
+                'turns': self._pending_turns
+            })
+            self._pending_turns = []
+            
+            self._manifest['turns'].append({'turn': turn_num, 'file': filename})
+            self._manifest['current_turn'] = turn_num
+            self._write_json('manifest.json', self._manifest)
+            return filepath
         return None
 
 # Global exporter instance
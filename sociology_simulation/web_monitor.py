@@ -1,53 +1,199 @@
 """Web monitoring, orchestration, and data export system for the simulation."""
 
 import asyncio
+import base64
+import concurrent.futures
+import copy
+import gzip
+import hashlib
 import json
 import logging
+import mimetypes
+import os
+import queue
+import re
 import threading
 import time
+import zlib
+from collections import OrderedDict, deque
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import websockets
+import websockets.exceptions
 from aiohttp import web
 from loguru import logger as loguru_logger
 from hydra import compose, initialize_config_dir
 from hydra.core.global_hydra import GlobalHydra
 from omegaconf import DictConfig
 
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional dependency
+    uvloop = None
+
+from .monitor_codec import (
+    agent_fields,
+    connections_marker,
+    flatten_resources,
+    flatten_terrain,
+    freeze,
+    memory_marker,
+    pack_terrain,
+)
+from .serialization import HAS_MSGPACK, dumps, loads, packb
+
 logger = logging.getLogger(__name__)
 
+# websockets>=14 (the asyncio implementation) sends pre-encoded UTF-8 bytes as
+# a text frame when asked to, so one encoded payload can be shared by every
+# client without re-encoding. It also takes a `select_subprotocol` callable.
+_WS_ASYNCIO_API = int(websockets.__version__.split(".", 1)[0]) >= 14
+
+# Clients offering this subprotocol receive the same JSON as binary frames,
+# skipping UTF-8 validation on both ends
+WS_BINARY_SUBPROTOCOL = "genesis.binary"
+# Clients offering this one receive full snapshots as binary MessagePack frames
+# (terrain codes as raw bytes); all other messages stay JSON text frames
+WS_MSGPACK_SUBPROTOCOL = "genesis.msgpack"
+# Clients offering this one receive every message as a zlib-compressed JSON
+# binary frame, compressed once per message rather than once per connection
+WS_DEFLATE_SUBPROTOCOL = "genesis.deflate"
+
+
+def _select_subprotocol(connection, subprotocols):
+    """Pick the preferred subprotocol offered; otherwise continue without one."""
+    if HAS_MSGPACK and WS_MSGPACK_SUBPROTOCOL in subprotocols:
+        return WS_MSGPACK_SUBPROTOCOL
+    if WS_DEFLATE_SUBPROTOCOL in subprotocols:
+        return WS_DEFLATE_SUBPROTOCOL
+    if WS_BINARY_SUBPROTOCOL in subprotocols:
+        return WS_BINARY_SUBPROTOCOL
+    return None
+
+def _json_response(data: Any, status: int = 200) -> web.Response:
+    """Like `web.json_response`, but encoded with the shared serializer."""
+    return web.Response(body=dumps(data), status=status, content_type="application/json")
+
+
+# Structure placement events announced in simulation logs
+_MARKET_RE = re.compile(r"New\s+market\s+established\s+at\s*\((\d+),\s*(\d+)\)\s*:\s*([\w-]+)", re.IGNORECASE)
+_SETTLEMENT_RE = re.compile(r"New\s+settlement\s+(?:established\s+)?at\s*\((\d+),\s*(\d+)\)\s*:?\s*([\w-]+)?", re.IGNORECASE)
+_BUILT_RE = re.compile(r"Built\s+(hut|house|workshop|temple)\s+at\s*\((\d+),\s*(\d+)\)", re.IGNORECASE)
+
+
+# Queued to stop the background export writer once earlier exports are written
+_EXPORT_STOP = object()
+
+# Queued to have the writer send a fresh full snapshot in the client's
+# encoding: on connect, on `request_update`, or in place of a dropped backlog
+_RESYNC = object()
+
+
+class _ClientChannel:
+    """Bounded outbound queue and writer task for one WebSocket client."""
+
+    __slots__ = ("websocket", "queue", "task", "binary", "msgpack", "deflate")
+
+    def __init__(self, websocket, maxsize: int):
+        self.websocket = websocket
+        subprotocol = getattr(websocket, "subprotocol", None)
+        self.deflate = subprotocol == WS_DEFLATE_SUBPROTOCOL
+        self.binary = self.deflate or subprotocol == WS_BINARY_SUBPROTOCOL
+        self.msgpack = subprotocol == WS_MSGPACK_SUBPROTOCOL
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.task: Optional[asyncio.Task] = None
+
 
 class SimulationMonitor:
     """Monitor and export simulation data for web UI consumption."""
+
+    # `/api/interactions` handlers by (role, action); agent interactions
+    # have no action
+    _INTERACTION_ROUTES = {
+        ("agent", None): "_queue_agent_interaction",
+        ("trinity", "broadcast"): "_trinity_broadcast",
+        ("trinity", "set_era"): "_trinity_set_era",
+    }
     
     def __init__(self, output_dir: str = "web_data"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
+        # Export settings
+        self.export_interval = 1  # Export every turn; 0 disables exports
+        self.max_log_entries = 1000
+        self.max_action_entries = 2000
+        # Per-turn exports are written by a background thread; only the newest
+        # pending snapshot is kept if the disk falls behind
+        self._export_queue: "queue.Queue[Tuple[int, bytes]]" = queue.Queue(maxsize=1)
+        self._export_thread: Optional[threading.Thread] = None
+        # Serializes writer start/stop with queueing from the simulation thread
+        self._export_lock = threading.Lock()
+        # gzip level for exports (1 is fast and typically 5-10x smaller); when
+        # set, files are written as `*.json.gz`. None writes plain JSON.
+        self.export_compresslevel: Optional[int] = None
+        # (turn, payload) last written; re-exporting the same cached bytes is skipped
+        self._last_export: Optional[Tuple[int, bytes]] = None
+
         # Current simulation state
+        self._logs: deque = deque(maxlen=self.max_log_entries)
+        self._actions: deque = deque(maxlen=self.max_action_entries)
         self.current_data = {
             "world": None,
             "agents": [],
             "turn": 0,
             "timestamp": None,
-            "logs": [],
-            "actions": [],
+            "logs": self._logs,
+            "actions": self._actions,
             "structures": [],
         }
 
+        # Encoded JSON reused until the data behind it changes. `_data_version`
+        # moves on any change (logs included); `_world_version` only when the
+        # world or agents change.
+        self._data_version = 0
+        self._world_version = 0
+        self._encoded_cache: Dict[str, Tuple[int, bytes]] = {}
+        # name -> (encoded body, ETag) for the data API responses
+        self._etag_cache: Dict[str, Tuple[bytes, str]] = {}
+        # path -> (body, gzipped body or None, ETag, content type) for built UI assets
+        self._static_cache: Dict[Path, Tuple[bytes, Optional[bytes], str, str]] = {}
+        # Set by the data API handlers so headless runs can skip snapshots
+        self._api_hit_recently = False
+
         # WebSocket connections
         self.websocket_clients = set()
         self.websocket_server = None
+        self._client_channels: Dict[Any, _ClientChannel] = {}
+        # Loop running the WebSocket server; broadcasts from the simulation
+        # thread are handed to it
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
         
         # HTTP server for API
         self.http_app = None
         self.http_server = None
         
-        # Export settings
-        self.export_interval = 1  # Export every turn
-        self.max_log_entries = 1000
-        self.max_action_entries = 2000
+        # Outbound messages buffered per client before it is resynced with a snapshot
+        self.client_queue_size = 64
+        # Seconds a single send may take before the client is disconnected
+        self.client_send_timeout = 5.0
+        # Transport buffer high-water mark; above it `send` waits for the
+        # socket to drain. Full snapshots exceed the websockets default (32 KiB).
+        self.ws_write_limit = 2 ** 20
+        # Log entries are coalesced into one `logs_batch`, sent
+        # `log_flush_interval` seconds after the first pending entry or as
+        # soon as `log_batch_size` entries are pending
+        self.log_flush_interval = 0.05
+        self.log_batch_size = 100
+        self.max_pending_logs = 500
+        self._log_flush_buffer: deque = deque(maxlen=self.max_pending_logs)
+        self._log_flush_armed = False
+        # An immediate (batch-size) flush is scheduled but has not run yet
+        self._log_flush_pending = False
+        self._log_flush_handle: Optional[asyncio.TimerHandle] = None
 
         # Simulation orchestration metadata
         self.simulation_status: Dict[str, Any] = {
@@ -64,6 +210,10 @@ class SimulationMonitor:
             "error": None,
         }
         self._world_reference = None
+        # Loop running the attached world; operator edits are applied there
+        self._world_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Seconds an interaction request waits for the simulation loop
+        self.world_call_timeout = 5.0
         self._stop_requested = False
         self.orchestrator = None  # Initialised lazily to avoid circular imports
         # Track last-known actions to emit structured action events per agent
@@ -71,17 +221,75 @@ class SimulationMonitor:
         # Track discovered structures (markets, settlements, buildings)
         self._structures: List[Dict[str, Any]] = []
         self._structure_ids: set = set()
+        # Serialized terrain/resource grids keyed by (world, <name>_version)
+        self._grid_cache: Dict[str, Tuple[Any, int, Any]] = {}
+        # Previous update, used to send per-turn deltas instead of full snapshots
+        self._prev_world_data: Dict[str, Any] = {}
+        self._prev_agents_by_aid: Dict[Any, Dict[str, Any]] = {}
+        # Turns were skipped without consumers; the next build starts afresh
+        self._skipped_updates = False
+        # aid -> (state key, agent dict); unchanged agents reuse their dict
+        self._agent_dict_cache: Dict[Any, Tuple[Tuple[Any, ...], Dict[str, Any]]] = {}
+        # Rebuild every agent dict this often in case nested details changed
+        self.agent_full_refresh_every = 10
+        # Send a full snapshot instead of the delta this often (turns); 0 disables
+        self.keyframe_interval = 50
 
     # ------------------------------------------------------------------
     # Simulation lifecycle helpers
     # ------------------------------------------------------------------
     def attach_world(self, world) -> None:
-        """Expose the live world object for operator interaction."""
+        """Expose the live world object for operator interaction.
+
+        Called from the loop that steps the world; interaction requests are
+        run on that loop so they never race a turn in progress.
+        """
         self._world_reference = world
+        try:
+            self._world_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._world_loop = None
 
     def detach_world(self) -> None:
         """Clear world reference when simulation stops."""
         self._world_reference = None
+        self._world_loop = None
+
+    async def _call_on_world_loop(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run `func(*args)` on the loop that steps the world and return its result.
+
+        Monitor-started simulations run on their own loop in a worker thread,
+        while requests arrive on the server loop. Raises `TimeoutError` if
+        the simulation loop does not get to it within `world_call_timeout`;
+        `func` is then not run at all.
+        """
+        loop = self._world_loop
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        if loop is None or loop is current or loop.is_closed():
+            return func(*args)
+
+        future: concurrent.futures.Future = concurrent.futures.Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return  # Caller gave up waiting
+            try:
+                future.set_result(func(*args))
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        try:
+            loop.call_soon_threadsafe(run)
+        except RuntimeError:
+            # Simulation loop closed meanwhile; nothing runs the world any more
+            return func(*args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.world_call_timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError("simulation loop did not respond") from None
 
     def get_world(self):
         """Return the active world instance, if any."""
@@ -117,15 +325,16 @@ class SimulationMonitor:
         if world is None:
             return 0
 
-        delivered = 0
         recipients = world.agents
         if targets:
             target_ids = set(targets)
             recipients = [agent for agent in world.agents if agent.aid in target_ids]
 
+        # One shared string for every recipient's log
+        line = f"【Trinity】{message}"
         for agent in recipients:
-            agent.log.append(f"【Trinity】{message}")
-            delivered += 1
+            agent.log.append(line)
+        delivered = len(recipients)
 
         if delivered:
             self.add_log_entry("INFO", f"Trinity broadcast delivered to {delivered} agents")
@@ -149,58 +358,126 @@ class SimulationMonitor:
             if current_era is None:
                 current_era = getattr(world, 'era_prompt', 'Stone Age')
 
-            world_data = {
-                "size": world.size,
+            # Keep orchestration status in sync
+            self.simulation_status.update({
                 "turn": turn,
                 "era": current_era,
-                "terrain": self._serialize_terrain(world),
-                "resources": self._serialize_resources(world),
-                "groups": self._serialize_groups(world),
-                "stats": self._calculate_world_stats(world, agents)
-            }
-            
-            # Extract agent data
+                "num_agents": len(agents),
+            })
+            if self._stop_requested:
+                self.simulation_status.setdefault("state", "running")
+                if self.simulation_status["state"] != "idle":
+                    self.simulation_status["state"] = "stopping"
+            elif self.simulation_status.get("state") in {"initializing", "starting"}:
+                self.simulation_status["state"] = "running"
+            self.simulation_status["error"] = None
+
+            # Skip building the snapshot when nobody will read it: no
+            # WebSocket clients, no export this turn, no recent API polling
+            export_due = self.export_interval > 0 and turn % self.export_interval == 0
+            if not (self.websocket_clients or export_due or self._api_hit_recently):
+                self._skipped_updates = True
+                return
+            self._api_hit_recently = False
+
+            # After skipped turns the delta baseline, agent cache and last
+            # actions describe a stale turn: rebuild everything, send a full
+            # snapshot and take current actions as the new baseline rather
+            # than reporting them as events
+            rebase = self._skipped_updates
+            self._skipped_updates = False
+            if rebase:
+                self._prev_world_data = {}
+                self._prev_agents_by_aid = {}
+                self._last_agent_action.clear()
+
+            # Extract agent data, reusing last turn's dict for unchanged agents
             agent_data = []
+            cache = (
+                {} if rebase or turn % self.agent_full_refresh_every == 0
+                else self._agent_dict_cache
+            )
+            next_cache = {}
+            active_agents = 0
+            action_events: List[Dict[str, Any]] = []
+            last_actions = self._last_agent_action
+            now = time.time()
             for agent in agents:
+                (aid, name, pos, health, inventory, skills, group_id, reputation,
+                 social_connections, memory) = agent_fields(agent)
+                action = getattr(agent, 'current_action', None)
+                if action:
+                    active_agents += 1
                 # Extract position coordinates
-                if hasattr(agent, 'pos') and agent.pos:
-                    x, y = agent.pos
+                if pos:
+                    x, y = pos
                 else:
                     x, y = getattr(agent, 'x', 0), getattr(agent, 'y', 0)
                 
-                agent_info = {
-                    "aid": agent.aid,
-                    "name": agent.name,
-                    "x": x,
-                    "y": y,
-                    "health": getattr(agent, 'health', 100),
-                    "current_action": getattr(agent, 'current_action', None),
-                    "inventory": dict(agent.inventory) if hasattr(agent, 'inventory') else {},
-                    "skills": dict(agent.skills) if hasattr(agent, 'skills') else {},
-                    "group_id": getattr(agent, 'group_id', None),
-                    "social_connections": self._serialize_social_connections(agent),
-                    "reputation": getattr(agent, 'reputation', 0),
-                    "memory": self._serialize_memory(agent)
-                }
+                # Inventory, skills and reputation are compared by content;
+                # social connections by what is serialized per connection and
+                # memory by size plus its newest entries.
+                state = (
+                    x, y, health, action,
+                    freeze(inventory), freeze(skills), group_id, freeze(reputation),
+                    connections_marker(social_connections),
+                    memory_marker(memory),
+                )
+                cached = cache.get(aid)
+                if cached is not None and cached[0] == state:
+                    agent_info = cached[1]
+                else:
+                    # Copy nested values so later in-place edits cannot leak
+                    # into dicts already cached or sent
+                    agent_info = {
+                        "aid": aid,
+                        "name": name,
+                        "x": x,
+                        "y": y,
+                        "health": health,
+                        "current_action": action,
+                        "inventory": dict(inventory) if inventory else {},
+                        "skills": {
+                            k: dict(v) if isinstance(v, dict) else v
+                            for k, v in skills.items()
+                        } if skills else {},
+                        "group_id": group_id,
+                        "social_connections": self._serialize_social_connections(agent),
+                        "reputation": dict(reputation) if isinstance(reputation, dict) else reputation,
+                        "memory": self._serialize_memory(agent)
+                    }
+                    # A reused dict means the action is unchanged too, so only
+                    # changed agents can start a new action
+                    if action and action != last_actions.get(aid):
+                        if not rebase:
+                            action_events.append({
+                                "aid": aid,
+                                "name": name,
+                                "action": action,
+                                "x": x,
+                                "y": y,
+                                "turn": turn,
+                                "timestamp": now,
+                            })
+                        last_actions[aid] = action
+                next_cache[aid] = (state, agent_info)
                 agent_data.append(agent_info)
+            self._agent_dict_cache = next_cache
+
+            resources, total_resources = self._resource_grid(world)
+            world_data = {
+                "size": world.size,
+                "turn": turn,
+                "era": current_era,
+                **self._encode_terrain(world),
+                "resources": resources,
+                "groups": self._serialize_groups(world),
+                "stats": self._calculate_world_stats(
+                    world, agents, active_agents=active_agents, total_resources=total_resources
+                )
+            }
             
-            # Detect agent action changes for action events
-            action_events: List[Dict[str, Any]] = []
-            for a in agent_data:
-                aid = a["aid"]
-                act = a.get("current_action")
-                last = self._last_agent_action.get(aid)
-                if act and act != last:
-                    action_events.append({
-                        "aid": aid,
-                        "name": a.get("name"),
-                        "action": act,
-                        "x": a.get("x"),
-                        "y": a.get("y"),
-                        "turn": turn,
-                        "timestamp": time.time(),
-                    })
-                    self._last_agent_action[aid] = act
+            delta = self._diff_snapshot(world_data, agent_data, turn)
 
             # Update current data
             self.current_data.update({
@@ -208,87 +485,98 @@ class SimulationMonitor:
                 "agents": agent_data,
                 "turn": turn,
                 "timestamp": time.time(),
-                # Maintain a rolling buffer of action events for consumers without WS
-                "actions": (self.current_data.get("actions", []) + action_events)[-self.max_action_entries:],
                 # Keep structures in sync
                 "structures": list(self._structures),
             })
-
-            # Keep orchestration status in sync
-            self.simulation_status.update({
-                "turn": turn,
-                "era": world_data.get("era"),
-                "num_agents": len(agent_data),
-            })
-            if self._stop_requested:
-                self.simulation_status.setdefault("state", "running")
-                if self.simulation_status["state"] != "idle":
-                    self.simulation_status["state"] = "stopping"
-            elif self.simulation_status.get("state") in {"initializing", "starting"}:
-                self.simulation_status["state"] = "running"
-            self.simulation_status["error"] = None
+            # Rolling buffer of action events for consumers without WS
+            self._actions.extend(action_events)
+            self._world_version += 1
+            self._data_version += 1
 
             # Export to file if needed
-            if turn % self.export_interval == 0:
-                self._export_to_file()
+            if export_due:
+                self._queue_export()
             
-            # Send to WebSocket clients
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    asyncio.create_task(self._broadcast_update())
-                    if action_events:
-                        asyncio.create_task(self._broadcast_actions(action_events))
-            except RuntimeError:
-                # No event loop running, skip WebSocket broadcast
-                pass
+            # Send to WebSocket clients; periodic keyframes bound client drift.
+            # Turns built only for an export or API poll schedule nothing.
+            if self.websocket_clients:
+                if rebase or (self.keyframe_interval > 0 and turn % self.keyframe_interval == 0):
+                    self._schedule(self._broadcast_keyframe)
+                else:
+                    self._schedule(self._broadcast_update, delta)
+                if action_events:
+                    self._schedule(self._broadcast_actions, action_events)
             
         except Exception as e:
             logger.error(f"Error updating world data: {e}")
     
-    def _serialize_terrain(self, world) -> List[str]:
-        """Serialize terrain data from either `world.map` (2D) or `world.terrain` (dict)."""
-        out: List[str] = []
-        # Preferred: 2D map from the modern World implementation
-        if hasattr(world, "map") and getattr(world, "map") is not None:
-            grid = world.map
-            # Flatten in row-major order: index = y * size + x
-            for y in range(world.size):
-                for x in range(world.size):
-                    try:
-                        out.append(grid[x][y])
-                    except Exception:
-                        out.append("GRASSLAND")
-            return out
-
-        # Fallback: dict-based terrain from simple runner
-        terr = getattr(world, "terrain", None)
-        if isinstance(terr, dict):
-            for y in range(world.size):
-                for x in range(world.size):
-                    out.append(terr.get((x, y), "GRASSLAND"))
-            return out
-
-        # Last resort: all grassland
-        for _y in range(world.size):
-            for _x in range(world.size):
-                out.append("GRASSLAND")
+    def _cached_by_version(self, name: str, world, build: Callable[[Any], Any],
+                           counter: Optional[str] = None) -> Any:
+        """Reuse `build(world)` while `world.<counter or name>_version` is unchanged.
+
+        Worlds without the version counter are rebuilt on every call.
+        """
+        version = getattr(world, f"{counter or name}_version", None)
+        if version is None:
+            return build(world)
+        hit = self._grid_cache.get(name)
+        if hit is not None and hit[0] is world and hit[1] == version:
+            return hit[2]
+        out = build(world)
+        self._grid_cache[name] = (world, version, out)
         return out
-    
+
+    def _diff_snapshot(self, world_data: Dict[str, Any], agent_data: List[Dict[str, Any]],
+                       turn: int) -> Dict[str, Any]:
+        """Describe what changed since the previous update.
+
+        Changed world fields and changed agents are sent whole, so applying a
+        delta twice, or on top of a newer full snapshot, is harmless.
+        """
+        prev_world = self._prev_world_data
+        world_changes = {}
+        for key, value in world_data.items():
+            old = prev_world.get(key)
+            # Cached grids are the same object when unchanged; skip comparing them
+            if old is not value and old != value:
+                world_changes[key] = value
+
+        prev_agents = self._prev_agents_by_aid
+        agents_by_aid = {agent["aid"]: agent for agent in agent_data}
+        # Reused agent dicts are the same object; skip comparing them
+        updated = [
+            agent for aid, agent in agents_by_aid.items()
+            if prev_agents.get(aid) is not agent and prev_agents.get(aid) != agent
+        ]
+        removed = [aid for aid in prev_agents if aid not in agents_by_aid]
+
+        self._prev_world_data = world_data
+        self._prev_agents_by_aid = agents_by_aid
+        return {
+            "turn": turn,
+            "timestamp": time.time(),
+            "world": world_changes,
+            "agents": {"updated": updated, "removed": removed},
+        }
+
+    def _serialize_terrain(self, world) -> List[str]:
+        """Serialize terrain, cached across turns by `world.terrain_version`."""
+        return self._cached_by_version("terrain", world, flatten_terrain)
+
     def _serialize_resources(self, world) -> List[Dict[str, int]]:
-        """Serialize resource data from dict keyed by (x,y)."""
-        resources: List[Dict[str, int]] = []
-        wr = getattr(world, "resources", {})
-        for y in range(world.size):
-            for x in range(world.size):
-                tile = {}
-                try:
-                    if (x, y) in wr:
-                        tile = dict(wr[(x, y)])
-                except Exception:
-                    tile = {}
-                resources.append(tile)
-        return resources
+        """Serialize resources, cached across turns by `world.resources_version`."""
+        return self._resource_grid(world)[0]
+
+    def _resource_grid(self, world) -> Tuple[List[Dict[str, int]], int]:
+        """Return the flat resource grid and total resource count, cached together."""
+        return self._cached_by_version("resources", world, flatten_resources)
+
+    def _encode_terrain(self, world) -> Dict[str, Any]:
+        """Pack terrain as one byte per tile, cached by `world.terrain_version`."""
+        return self._cached_by_version(
+            "terrain_codes", world, lambda w: pack_terrain(self._serialize_terrain(w)),
+            counter="terrain",
+        )
     
     def _serialize_groups(self, world) -> List[Dict[str, Any]]:
         """Serialize group data."""
@@ -352,13 +640,22 @@ class SimulationMonitor:
                 pass
         return out
     
-    def _calculate_world_stats(self, world, agents: List) -> Dict[str, Any]:
-        """Calculate world statistics."""
+    def _calculate_world_stats(self, world, agents: List, active_agents: Optional[int] = None,
+                               total_resources: Optional[int] = None) -> Dict[str, Any]:
+        """Calculate world statistics.
+
+        `update_world_data` passes the counts it already gathered while
+        serializing agents and resources, so those are not walked twice.
+        """
+        if active_agents is None:
+            active_agents = len([a for a in agents if getattr(a, 'current_action', None)])
+        if total_resources is None:
+            total_resources = self._resource_grid(world)[1] if hasattr(world, 'resources') else 0
         stats = {
             "total_agents": len(agents),
-            "active_agents": len([a for a in agents if getattr(a, 'current_action', None)]),
+            "active_agents": active_agents,
             "total_groups": 0,
-            "total_resources": 0,
+            "total_resources": total_resources,
             "technologies_discovered": 0
         }
         
@@ -366,11 +663,6 @@ class SimulationMonitor:
         if hasattr(world, 'social_manager') and hasattr(world.social_manager, 'groups'):
             stats["total_groups"] = len(world.social_manager.groups)
         
-        # Count resources
-        if hasattr(world, 'resources'):
-            for tile_resources in world.resources.values():
-                stats["total_resources"] += sum(tile_resources.values())
-        
         # Count technologies
         if hasattr(world, 'tech_system') and hasattr(world.tech_system, 'discovered_techs'):
             stats["technologies_discovered"] = len(world.tech_system.discovered_techs)
@@ -386,11 +678,9 @@ class SimulationMonitor:
             "agent_id": agent_id
         }
         
-        self.current_data["logs"].append(log_entry)
-        
-        # Keep only recent logs
-        if len(self.current_data["logs"]) > self.max_log_entries:
-            self.current_data["logs"] = self.current_data["logs"][-self.max_log_entries:]
+        # Bounded deque evicts the oldest entry
+        self._logs.append(log_entry)
+        self._data_version += 1
 
         # Attempt to extract structured structures from log messages
         new_struct = self._maybe_extract_structure_from_message(message)
@@ -398,64 +688,200 @@ class SimulationMonitor:
             self._structures.append(new_struct)
             self._structure_ids.add(new_struct["id"])
             self.current_data["structures"] = list(self._structures)
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    asyncio.create_task(self._broadcast_structures([new_struct]))
-            except RuntimeError:
-                pass
-
-        # Send log to WebSocket clients
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                asyncio.create_task(self._broadcast_log(log_entry))
-        except RuntimeError:
-            # No event loop running, skip WebSocket broadcast
-            pass
+            if self.websocket_clients:
+                self._schedule(self._broadcast_structures, [new_struct])
+
+        # Queue for the next `logs_batch`; the oldest pending entries are
+        # dropped on a flood, clients still get them via the snapshot logs
+        if self.websocket_clients:
+            buffer = self._log_flush_buffer
+            buffer.append(log_entry)
+            if len(buffer) >= self.log_batch_size:
+                # One scheduled flush drains everything appended until it runs
+                if not self._log_flush_pending:
+                    self._log_flush_pending = True
+                    self._schedule(self._flush_logs)
+            elif not self._log_flush_armed:
+                self._log_flush_armed = True
+                self._schedule(self._arm_log_flush)
     
+    def _recent_logs(self, limit: int) -> List[Dict[str, Any]]:
+        """Return the newest `limit` log entries, oldest first."""
+        logs = self._logs
+        return list(islice(logs, max(0, len(logs) - limit), None))
+
     def _export_to_file(self):
         """Export current data to JSON file."""
         try:
-            filename = f"simulation_turn_{self.current_data['turn']:03d}.json"
-            filepath = self.output_dir / filename
+            payload = self._snapshot_bytes()
+        except Exception as e:
+            logger.error(f"Error exporting to file: {e}")
+            return
+        self._write_export(self.current_data['turn'], payload)
+
+    def _queue_export(self):
+        """Encode the current data and hand it to the background writer."""
+        try:
+            payload = self._snapshot_bytes()
+        except Exception as e:
+            logger.error(f"Error exporting to file: {e}")
+            return
+        
+        item = (self.current_data['turn'], payload)
+        with self._export_lock:
+            if self._export_thread is None:
+                self._export_thread = threading.Thread(
+                    target=self._export_writer_loop, name="monitor-export", daemon=True
+                )
+                self._export_thread.start()
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.current_data, f, indent=2, ensure_ascii=False)
+            try:
+                self._export_queue.put_nowait(item)
+            except queue.Full:
+                # Writer is behind: replace the stale snapshot with this one
+                try:
+                    self._export_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self._export_queue.put_nowait(item)
+
+    def _export_writer_loop(self):
+        """Write queued snapshots to disk off the simulation thread."""
+        while True:
+            item = self._export_queue.get()
+            if item is _EXPORT_STOP:
+                return
+            self._write_export(*item)
+
+    def flush_exports(self, timeout: float = 10.0) -> None:
+        """Write any pending export and stop the background writer.
+
+        Blocks until the writer has finished or `timeout` seconds passed; the
+        next queued export starts a new writer.
+        """
+        with self._export_lock:
+            thread = self._export_thread
+            if thread is None:
+                return
+            self._export_thread = None
+            deadline = time.monotonic() + timeout
+            try:
+                # Waits for the writer to take a pending export first
+                self._export_queue.put(_EXPORT_STOP, timeout=timeout)
+            except queue.Full:
+                logger.warning("Export writer did not take the pending export in time")
+                return
+        thread.join(max(0.0, deadline - time.monotonic()))
+        if thread.is_alive():
+            logger.warning(f"Export writer did not finish within {timeout}s")
+
+    def _write_export(self, turn: int, payload: bytes):
+        """Write the per-turn file and point `latest.json` at it, atomically."""
+        last = self._last_export
+        if last is not None and last[0] == turn and last[1] is payload:
+            # Snapshot bytes are cached per data version, so this is unchanged
+            return
+        original = payload
+        try:
+            suffix = ".json"
+            if self.export_compresslevel is not None:
+                payload = gzip.compress(payload, compresslevel=self.export_compresslevel, mtime=0)
+                suffix = ".json.gz"
+            filepath = self.output_dir / f"simulation_turn_{turn:03d}{suffix}"
+            self._write_atomic(filepath, payload)
             
-            # Also update latest.json
-            latest_path = self.output_dir / "latest.json"
-            with open(latest_path, 'w', encoding='utf-8') as f:
-                json.dump(self.current_data, f, indent=2, ensure_ascii=False)
+            # Also update latest.json: hard link to the same inode instead of
+            # writing the bytes twice. Sharing relies on every writer in this
+            # directory (this monitor and WebDataExporter, which reuses the
+            # `simulation_turn_*` names) swapping files in with os.replace
+            # rather than truncating them in place.
+            latest_path = self.output_dir / f"latest{suffix}"
+            tmp_link = latest_path.with_name(f"{latest_path.name}.{threading.get_ident()}.tmp")
+            try:
+                os.link(filepath, tmp_link)
+                os.replace(tmp_link, latest_path)
+            except OSError:
+                # No hard link support (e.g. FAT, some network mounts)
+                self._write_atomic(latest_path, payload)
+            self._last_export = (turn, original)
                 
         except Exception as e:
             logger.error(f"Error exporting to file: {e}")
+
+    @staticmethod
+    def _write_atomic(path: Path, payload: bytes):
+        """Write via a temp file and `os.replace` so readers never see a partial file."""
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
     
-    async def _broadcast_update(self):
-        """Broadcast simulation update to all WebSocket clients."""
+    def _broadcast_update(self, delta: Dict[str, Any]):
+        """Broadcast the per-turn delta to all WebSocket clients.
+
+        Clients receive the full snapshot on connect and on `request_update`.
+        """
         if not self.websocket_clients:
             return
         
         message = {
-            "type": "simulation_update",
-            "data": self.current_data
+            "type": "simulation_delta",
+            "data": delta
         }
         
-        await self._broadcast_message(message)
-    
-    async def _broadcast_log(self, log_entry: Dict[str, Any]):
-        """Broadcast log entry to all WebSocket clients."""
-        if not self.websocket_clients:
+        self._broadcast_message(message)
+
+    def _broadcast_keyframe(self):
+        """Resync every client with a full snapshot in its own encoding."""
+        for channel in list(self._client_channels.values()):
+            self._enqueue(channel, _RESYNC)
+
+    def _schedule(self, broadcast: Callable[..., Any], *args: Any) -> None:
+        """Run a broadcast callback on the server loop, from any thread.
+
+        Broadcasts only encode and enqueue, so they run as plain loop
+        callbacks rather than tasks. Skipped when the server is not running
+        or nobody is connected.
+        """
+        loop = self._loop
+        if loop is None or not self.websocket_clients:
             return
-        
-        message = {
-            "type": "log_entry",
-            "data": log_entry
-        }
-        
-        await self._broadcast_message(message)
+        try:
+            # Thread check avoids get_running_loop() raising off-loop
+            if threading.get_ident() == self._loop_thread:
+                loop.call_soon(broadcast, *args)
+            else:
+                loop.call_soon_threadsafe(broadcast, *args)
+        except RuntimeError:
+            # Loop closed while the simulation was still reporting
+            pass
+
+    def _flush_logs(self):
+        """Broadcast pending log entries as a single `logs_batch` message."""
+        # Disarm before draining so entries appended meanwhile arm a new flush
+        self._log_flush_armed = False
+        self._log_flush_pending = False
+        if self._log_flush_handle is not None:
+            self._log_flush_handle.cancel()
+            self._log_flush_handle = None
+        buffer = self._log_flush_buffer
+        if not buffer:
+            return
+        # popleft is safe against appends from the simulation thread
+        batch = [buffer.popleft() for _ in range(len(buffer))]
+        self._broadcast_message({
+            "type": "logs_batch",
+            "data": batch
+        })
+
+    def _arm_log_flush(self):
+        """Flush pending log entries after `log_flush_interval` seconds."""
+        if self._log_flush_handle is None and self._loop is not None:
+            self._log_flush_handle = self._loop.call_later(
+                self.log_flush_interval, self._flush_logs
+            )
 
-    async def _broadcast_actions(self, events: List[Dict[str, Any]]):
+    def _broadcast_actions(self, events: List[Dict[str, Any]]):
         """Broadcast per-agent action events to all WebSocket clients."""
         if not self.websocket_clients or not events:
             return
@@ -463,9 +889,9 @@ class SimulationMonitor:
             "type": "actions_update",
             "data": {"events": events},
         }
-        await self._broadcast_message(message)
+        self._broadcast_message(message)
 
-    async def _broadcast_structures(self, items: List[Dict[str, Any]]):
+    def _broadcast_structures(self, items: List[Dict[str, Any]]):
         """Broadcast new structures to all WebSocket clients."""
         if not self.websocket_clients or not items:
             return
@@ -473,7 +899,7 @@ class SimulationMonitor:
             "type": "structures_update",
             "data": {"structures": items},
         }
-        await self._broadcast_message(message)
+        self._broadcast_message(message)
 
     def _maybe_extract_structure_from_message(self, text: str) -> Optional[Dict[str, Any]]:
         """Parse simulation logs to extract structure placement events.
@@ -483,22 +909,25 @@ class SimulationMonitor:
           - "New settlement at (x, y): FooVillage"
           - "Built hut at (3, 4)"
         """
+        # Most log lines mention neither; skip the patterns for those
+        lowered = text.lower()
+        if "new" not in lowered and "built" not in lowered:
+            return None
         try:
-            import re
-            m = re.search(r"New\s+market\s+established\s+at\s*\((\d+),\s*(\d+)\)\s*:\s*([\w-]+)", text, re.IGNORECASE)
+            m = _MARKET_RE.search(text)
             if m:
                 x, y, sid = int(m.group(1)), int(m.group(2)), m.group(3)
                 if sid not in self._structure_ids:
                     return {"id": sid, "kind": "market", "name": sid, "x": x, "y": y}
 
-            m = re.search(r"New\s+settlement\s+(?:established\s+)?at\s*\((\d+),\s*(\d+)\)\s*:?\s*([\w-]+)?", text, re.IGNORECASE)
+            m = _SETTLEMENT_RE.search(text)
             if m:
                 x, y = int(m.group(1)), int(m.group(2))
                 name = m.group(3) or f"settlement_{x}_{y}"
                 if name not in self._structure_ids:
                     return {"id": name, "kind": "settlement", "name": name, "x": x, "y": y}
 
-            m = re.search(r"Built\s+(hut|house|workshop|temple)\s+at\s*\((\d+),\s*(\d+)\)", text, re.IGNORECASE)
+            m = _BUILT_RE.search(text)
             if m:
                 kind = m.group(1).lower()
                 x, y = int(m.group(2)), int(m.group(3))
@@ -509,53 +938,193 @@ class SimulationMonitor:
             return None
         return None
     
-    async def _broadcast_message(self, message: Dict[str, Any]):
-        """Broadcast message to all WebSocket clients."""
-        if not self.websocket_clients:
+    def _broadcast_message(self, message: Dict[str, Any]):
+        """Encode a message once and queue it for every WebSocket client.
+
+        Must run on the server loop; the per-client writers do the sending.
+        """
+        if not self._client_channels:
             return
         
-        message_str = json.dumps(message)
-        disconnected_clients = set()
-        
-        for client in self.websocket_clients:
-            try:
-                await client.send(message_str)
-            except websockets.exceptions.ConnectionClosed:
-                disconnected_clients.add(client)
-            except Exception as e:
-                logger.error(f"Error sending message to client: {e}")
-                disconnected_clients.add(client)
-        
-        # Remove disconnected clients
-        self.websocket_clients -= disconnected_clients
+        payload = dumps(message)
+        compressed = None
+        for channel in list(self._client_channels.values()):
+            if channel.deflate:
+                if compressed is None:
+                    compressed = zlib.compress(payload, 1)
+                self._enqueue(channel, compressed)
+            else:
+                self._enqueue(channel, payload)
+
+    def _enqueue(self, channel: _ClientChannel, payload: Any) -> None:
+        """Queue a payload without blocking; a slow client only delays itself."""
+        queue = channel.queue
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Deltas cannot be skipped safely, so replace the whole backlog
+            # with a single full snapshot sent when the client catches up.
+            while not queue.empty():
+                queue.get_nowait()
+                queue.task_done()
+            queue.put_nowait(_RESYNC)
+
+    async def _send_to(self, websocket, payload: bytes) -> None:
+        """Send through the client's queue so replies stay ordered with broadcasts."""
+        channel = self._client_channels.get(websocket)
+        if channel is None:
+            await self._send_payload(websocket, payload)
+        else:
+            self._enqueue(channel, zlib.compress(payload, 1) if channel.deflate else payload)
+
+    async def _send_snapshot(self, websocket) -> None:
+        """Send the full snapshot, through the client's queue when it has one."""
+        channel = self._client_channels.get(websocket)
+        if channel is None:
+            await self._send_payload(websocket, self._snapshot_payload())
+        else:
+            self._enqueue(channel, _RESYNC)
+
+    def _encoded(self, name: str, version: int, build: Callable[[], Any],
+                 encode: Callable[[Any], bytes] = dumps) -> bytes:
+        """Return `encode(build())`, re-encoding only when `version` changes.
+
+        Callers read the version before building, so a change made while
+        encoding leaves the entry stale and it is rebuilt on the next call.
+        """
+        hit = self._encoded_cache.get(name)
+        if hit is not None and hit[0] == version:
+            return hit[1]
+        payload = encode(build())
+        self._encoded_cache[name] = (version, payload)
+        return payload
+
+    def _snapshot_bytes(self) -> bytes:
+        """Encoded `current_data`, shared by exports, the API and resyncs."""
+        return self._encoded("snapshot", self._data_version, lambda: self.current_data)
+
+    def _msgpack_data(self) -> Dict[str, Any]:
+        """Shallow copy of `current_data` with terrain codes as raw bytes."""
+        data = dict(self.current_data)
+        world = data.get("world")
+        if world and "terrain_codes" in world:
+            world = dict(world)
+            world["terrain_codes"] = base64.b64decode(world["terrain_codes"])
+            data["world"] = world
+        return data
+
+    def _snapshot_msgpack(self) -> bytes:
+        """Full `simulation_update` message as MessagePack, terrain codes as raw bytes."""
+        return self._encoded(
+            "snapshot_msgpack", self._data_version,
+            lambda: {"type": "simulation_update", "data": self._msgpack_data()},
+            encode=packb,
+        )
+
+    def _snapshot_payload(self) -> bytes:
+        """Encode the full `simulation_update` message for the current state."""
+        # Wrap the cached snapshot instead of encoding current_data again
+        return b'{"type":"simulation_update","data":' + self._snapshot_bytes() + b'}'
+
+    def _snapshot_deflate(self) -> bytes:
+        """`_snapshot_payload` compressed for `genesis.deflate` clients."""
+        return self._encoded(
+            "snapshot_deflate", self._data_version, self._snapshot_payload,
+            encode=lambda payload: zlib.compress(payload, 1),
+        )
+
+    async def _client_writer(self, channel: _ClientChannel) -> None:
+        """Drain one client's queue until it disconnects."""
+        websocket = channel.websocket
+        try:
+            while True:
+                payload = await channel.queue.get()
+                try:
+                    if payload is _RESYNC:
+                        if channel.msgpack:
+                            send = websocket.send(self._snapshot_msgpack())
+                        elif channel.deflate:
+                            send = websocket.send(self._snapshot_deflate())
+                        else:
+                            send = self._send_payload(websocket, self._snapshot_payload(), channel.binary)
+                    else:
+                        send = self._send_payload(websocket, payload, channel.binary)
+                    await asyncio.wait_for(send, self.client_send_timeout)
+                finally:
+                    # Lets `flush` wait until everything queued has been sent
+                    channel.queue.task_done()
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        except asyncio.TimeoutError:
+            logger.warning(f"Disconnecting WebSocket client stalled for over {self.client_send_timeout}s")
+            await websocket.close()
+        except Exception as e:
+            logger.error(f"Error sending message to client: {e}")
+        finally:
+            self._drop_client(websocket)
+
+    async def flush(self, timeout: float = 5.0) -> None:
+        """Send pending log entries, write pending exports and wait up to
+        `timeout` for client queues to drain."""
+        self._flush_logs()
+        await asyncio.to_thread(self.flush_exports, timeout)
+        drains = [
+            asyncio.ensure_future(channel.queue.join())
+            for channel in list(self._client_channels.values())
+        ]
+        if drains:
+            # Clients that disconnect meanwhile never drain; stop waiting at the timeout
+            _, pending = await asyncio.wait(drains, timeout=timeout)
+            for drain in pending:
+                drain.cancel()
+
+    def _drop_client(self, websocket) -> None:
+        """Stop broadcasting to a client."""
+        self.websocket_clients.discard(websocket)
+        self._client_channels.pop(websocket, None)
+
+    @staticmethod
+    async def _send_payload(client, payload: bytes, binary: bool = False) -> None:
+        """Send pre-encoded JSON bytes to a client as a text or binary frame."""
+        if binary:
+            await client.send(payload)
+        elif _WS_ASYNCIO_API:
+            await client.send(payload, text=True)
+        else:
+            await client.send(payload.decode("utf-8"))
     
     async def websocket_handler(self, websocket, path=None):
         """Handle WebSocket connections."""
         logger.info(f"New WebSocket client connected from {websocket.remote_address}")
+        channel = _ClientChannel(websocket, self.client_queue_size)
+        self._client_channels[websocket] = channel
         self.websocket_clients.add(websocket)
+        channel.task = asyncio.create_task(self._client_writer(channel))
         
         try:
             # Send current data to new client
             if self.current_data["world"]:
-                await websocket.send(json.dumps({
-                    "type": "simulation_update",
-                    "data": self.current_data
-                }))
+                self._enqueue(channel, _RESYNC)
             
             # Keep connection alive
-            async for message in websocket:
+            while True:
+                # Raw bytes: the JSON parser validates UTF-8 itself, so skip
+                # websockets' separate decode of each text frame
+                message = await (websocket.recv(decode=False) if _WS_ASYNCIO_API else websocket.recv())
                 try:
-                    data = json.loads(message)
+                    data = loads(message)
                     await self._handle_websocket_message(websocket, data)
-                except json.JSONDecodeError:
-                    logger.error(f"Invalid JSON received from client: {message}")
+                except ValueError:
+                    # JSONDecodeError, or invalid UTF-8 with the stdlib parser
+                    logger.error(f"Invalid JSON received from client: {message!r}")
                 
         except websockets.exceptions.ConnectionClosed:
             logger.info("WebSocket client disconnected")
         except Exception as e:
             logger.error(f"WebSocket error: {e}")
         finally:
-            self.websocket_clients.discard(websocket)
+            self._drop_client(websocket)
+            channel.task.cancel()
     
     async def _handle_websocket_message(self, websocket, data: Dict[str, Any]):
         """Handle incoming WebSocket messages."""
@@ -563,29 +1132,41 @@ class SimulationMonitor:
         
         if message_type == "request_update":
             # Send current data
-            await websocket.send(json.dumps({
-                "type": "simulation_update",
-                "data": self.current_data
-            }))
+            await self._send_snapshot(websocket)
         elif message_type == "request_logs":
             # Send recent logs
-            await websocket.send(json.dumps({
+            await self._send_to(websocket, dumps({
                 "type": "logs_update",
-                "data": {"logs": self.current_data["logs"][-50:]}  # Last 50 logs
+                "data": {"logs": self._recent_logs(50)}
             }))
     
     async def start_websocket_server(self, host: str = "localhost", port: int = 8765):
         """Start WebSocket server."""
         try:
+            # Per-connection permessage-deflate would compress every broadcast
+            # once per client; clients wanting compression negotiate
+            # `genesis.deflate` and share one compressed payload instead
+            options: Dict[str, Any] = {"compression": None, "write_limit": self.ws_write_limit}
+            if _WS_ASYNCIO_API:
+                options["select_subprotocol"] = _select_subprotocol
             self.websocket_server = await websockets.serve(
-                self.websocket_handler, host, port
+                self.websocket_handler, host, port, **options
             )
+            self._loop = asyncio.get_running_loop()
+            self._loop_thread = threading.get_ident()
             logger.info(f"WebSocket server started on {host}:{port}")
         except Exception as e:
             logger.error(f"Error starting WebSocket server: {e}")
     
     async def stop_websocket_server(self):
         """Stop WebSocket server."""
+        self._loop = None
+        self._loop_thread = None
+        if self._log_flush_handle is not None:
+            self._log_flush_handle.cancel()
+            self._log_flush_handle = None
+        self._log_flush_armed = False
+        self._log_flush_pending = False
         if self.websocket_server:
             self.websocket_server.close()
             await self.websocket_server.wait_closed()
@@ -613,11 +1194,19 @@ class SimulationMonitor:
             control_page = web_ui_path / "control.html"
 
             if monitor_dist.exists() and (monitor_dist / "index.html").exists():
-                # Serve the React monitor build when available
-                async def _serve_monitor_index(_request):
-                    return web.FileResponse(path=monitor_dist / "index.html")
+                # Serve the React monitor build when available; its hashed
+                # assets are held in memory, pre-gzipped and cached for good
+                async def _serve_monitor_index(request):
+                    return await self._serve_static_asset(request, monitor_dist / "index.html")
+
+                assets_root = (monitor_dist / "assets").resolve()
+
+                async def _serve_monitor_asset(request):
+                    path = self._monitor_asset_path(assets_root, request.match_info["filename"])
+                    return await self._serve_static_asset(request, path, immutable=True)
 
                 self.http_app.router.add_get('/', _serve_monitor_index)
+                self.http_app.router.add_get('/assets/{filename:.+}', _serve_monitor_asset)
                 self.http_app.router.add_static('/', monitor_dist, name='static-monitor')
                 logger.info("Serving React monitor (dist) at '/'")
             else:
@@ -633,50 +1222,134 @@ class SimulationMonitor:
 
         return self.http_app
     
+    def _monitor_asset_path(self, assets_root: Path, filename: str) -> Path:
+        """Cache key for a build asset, the same however the URL spells it.
+
+        `assets_root` must be resolved. Only keys not cached yet are checked
+        on disk to stay inside it.
+        """
+        path = assets_root / os.path.normpath(filename)
+        if path not in self._static_cache:
+            resolved = path.resolve()
+            if assets_root not in resolved.parents or not resolved.is_file():
+                raise web.HTTPNotFound()
+        return path
+
+    async def _serve_static_asset(self, request, path: Path,
+                                  immutable: bool = False) -> web.Response:
+        """Serve a UI file from memory, gzipped when accepted, with an ETag.
+
+        Files are read once; `immutable` marks content-hashed build assets.
+        """
+        entry = self._static_cache.get(path)
+        if entry is None:
+            entry = await asyncio.get_running_loop().run_in_executor(
+                None, self._load_static_asset, path
+            )
+            self._static_cache[path] = entry
+        body, gzipped, etag, content_type = entry
+        headers = {
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+            "Cache-Control": "public, max-age=31536000, immutable" if immutable else "no-cache",
+        }
+        if etag in request.headers.get("If-None-Match", ""):
+            return web.Response(status=304, headers=headers)
+        if gzipped is not None and "gzip" in request.headers.get("Accept-Encoding", ""):
+            body = gzipped
+            headers["Content-Encoding"] = "gzip"
+        return web.Response(body=body, content_type=content_type, headers=headers)
+
+    @staticmethod
+    def _load_static_asset(path: Path) -> Tuple[bytes, Optional[bytes], str, str]:
+        """Read a file and precompute its gzip copy (text types only), ETag and type."""
+        body = path.read_bytes()
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        compressible = content_type.startswith("text/") or content_type in (
+            "application/javascript", "application/json", "image/svg+xml"
+        )
+        gzipped = gzip.compress(body, compresslevel=6, mtime=0) if compressible and len(body) > 1024 else None
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        return body, gzipped, etag, content_type
+
+    def _cached_response(self, request, name: str, version: int,
+                         build: Callable[[], Any], encode: Callable[[Any], bytes] = dumps,
+                         content_type: str = "application/json") -> web.Response:
+        """Serve a cached encoding with an ETag; 304 when the client's copy is current."""
+        self._api_hit_recently = True
+        body = self._encoded(name, version, build, encode=encode)
+        hit = self._etag_cache.get(name)
+        if hit is None or hit[0] is not body:
+            hit = (body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"')
+            self._etag_cache[name] = hit
+        etag = hit[1]
+        if etag in request.headers.get("If-None-Match", ""):
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=body, content_type=content_type, headers={"ETag": etag})
+
     async def _api_simulation_data(self, request):
-        """API endpoint for simulation data."""
-        return web.json_response(self.current_data)
+        """API endpoint for simulation data; MessagePack if the client accepts it."""
+        if HAS_MSGPACK and "application/msgpack" in request.headers.get("Accept", ""):
+            response = self._cached_response(
+                request, "snapshot_data_msgpack", self._data_version, self._msgpack_data,
+                encode=packb, content_type="application/msgpack",
+            )
+        else:
+            response = self._cached_response(
+                request, "snapshot", self._data_version, lambda: self.current_data
+            )
+        response.headers["Vary"] = "Accept"
+        return response
     
     async def _api_agents(self, request):
         """API endpoint for agents data."""
-        return web.json_response({"agents": self.current_data["agents"]})
+        return self._cached_response(
+            request, "agents", self._world_version, lambda: {"agents": self.current_data["agents"]}
+        )
     
     async def _api_world(self, request):
         """API endpoint for world data."""
-        return web.json_response({"world": self.current_data["world"]})
+        return self._cached_response(
+            request, "world", self._world_version, lambda: {"world": self.current_data["world"]}
+        )
     
     async def _api_logs(self, request):
         """API endpoint for logs."""
         limit = int(request.query.get('limit', 50))
-        logs = self.current_data["logs"][-limit:]
-        return web.json_response({"logs": logs})
+        return _json_response({"logs": self._recent_logs(limit)})
 
     async def _api_structures(self, request):
         """Return known structures placed on the map."""
-        return web.json_response({"structures": self.current_data.get("structures", [])})
+        return _json_response({"structures": self.current_data.get("structures", [])})
 
     async def _api_simulation_status(self, request):
-        """Return orchestration status for dashboards."""
-        return web.json_response({"status": self.get_simulation_status()})
+        """Return orchestration status for dashboards; 304 while unchanged."""
+        # Status is edited in place without a version, so key on its content
+        body = dumps({"status": self.get_simulation_status()})
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=body, content_type="application/json", headers={"ETag": etag})
 
     async def _api_start_simulation(self, request):
         """Start a new simulation run with optional overrides."""
         controller = self._ensure_orchestrator()
         if controller.is_running():
-            return web.json_response({"error": "Simulation already running"}, status=400)
+            return _json_response({"error": "Simulation already running"}, status=400)
 
         payload: Dict[str, Any] = {}
         if request.can_read_body:
             try:
-                payload = await request.json()
-            except json.JSONDecodeError:
-                return web.json_response({"error": "Invalid JSON payload"}, status=400)
+                # Parse the raw body; request.json() would decode it to str first
+                payload = loads(await request.read())
+            except ValueError:
+                return _json_response({"error": "Invalid JSON payload"}, status=400)
 
         overrides = payload.get("overrides", [])
         if overrides is None:
             overrides = []
         if not isinstance(overrides, list):
-            return web.json_response({"error": "overrides must be a list"}, status=400)
+            return _json_response({"error": "overrides must be a list"}, status=400)
 
         overrides = list(overrides)
 
@@ -698,16 +1371,16 @@ class SimulationMonitor:
                 try:
                     value = int(payload[field])
                 except (TypeError, ValueError):
-                    return web.json_response({"error": f"{field} must be an integer"}, status=400)
+                    return _json_response({"error": f"{field} must be an integer"}, status=400)
                 overrides.append(f"{key}={value}")
 
         try:
             cfg = await controller.start(overrides)
         except RuntimeError as exc:
-            return web.json_response({"error": str(exc)}, status=400)
+            return _json_response({"error": str(exc)}, status=400)
         except Exception as exc:  # pragma: no cover - defensive guard for unexpected failures
             logger.exception("Failed to start simulation via monitor", exc_info=exc)
-            return web.json_response({"error": "Failed to start simulation"}, status=500)
+            return _json_response({"error": "Failed to start simulation"}, status=500)
 
         summary = {
             "era": cfg.simulation.era_prompt,
@@ -716,7 +1389,7 @@ class SimulationMonitor:
             "world_size": cfg.world.size,
         }
 
-        return web.json_response({
+        return _json_response({
             "status": "starting",
             "config": summary,
             "overrides": overrides,
@@ -726,94 +1399,106 @@ class SimulationMonitor:
         """Request the running simulation to stop."""
         controller = self._ensure_orchestrator()
         if not controller.is_running():
-            return web.json_response({"status": self.simulation_status.get("state", "idle")})
+            return _json_response({"status": self.simulation_status.get("state", "idle")})
 
         await controller.stop()
         self.update_status(state="stopping")
-        return web.json_response({"status": "stopping"})
+        return _json_response({"status": "stopping"})
 
     async def _api_create_interaction(self, request):
         """Queue operator interactions or Trinity directives."""
         if self.get_world() is None:
-            return web.json_response({"error": "Simulation is not running"}, status=400)
+            return _json_response({"error": "Simulation is not running"}, status=400)
 
         if not request.can_read_body:
-            return web.json_response({"error": "Missing JSON payload"}, status=400)
+            return _json_response({"error": "Missing JSON payload"}, status=400)
 
         try:
-            payload = await request.json()
-        except json.JSONDecodeError:
-            return web.json_response({"error": "Invalid JSON payload"}, status=400)
+            payload = loads(await request.read())
+        except ValueError:
+            return _json_response({"error": "Invalid JSON payload"}, status=400)
 
         role = payload.get("role", "agent")
+        action = payload.get("action", "broadcast") if role == "trinity" else None
+        try:
+            route = self._INTERACTION_ROUTES.get((role, action))
+        except TypeError:
+            # Unhashable role/action, e.g. a list
+            route = None
+        if route is None:
+            if role == "trinity":
+                return _json_response({"error": f"Unknown Trinity action '{action}'"}, status=400)
+            return _json_response({"error": f"Unknown role '{role}'"}, status=400)
+        # Handlers touch world state, so they run on the simulation's loop
+        try:
+            return await self._call_on_world_loop(getattr(self, route), payload)
+        except TimeoutError:
+            return _json_response({"error": "Simulation is busy, try again"}, status=503)
+
+    def _queue_agent_interaction(self, payload: Dict[str, Any]) -> web.Response:
+        """Queue an interaction between two agents."""
+        # JSON numbers already decode to int; `type() is` also rejects bools
+        agent_id = payload.get("agent_id")
+        target_id = payload.get("target_id")
+        if type(agent_id) is not int or type(target_id) is not int:
+            return _json_response({"error": "agent_id and target_id must be integers"}, status=400)
+
+        content = payload.get("content")
+        if not content:
+            return _json_response({"error": "content is required"}, status=400)
+
+        interaction_type = payload.get("interaction_type", "chat")
+        interaction = {
+            "type": interaction_type,
+            "source_id": agent_id,
+            "target_id": target_id,
+            "content": content,
+        }
 
-        if role == "agent":
-            try:
-                agent_id = int(payload["agent_id"])
-                target_id = int(payload["target_id"])
-            except (KeyError, TypeError, ValueError):
-                return web.json_response({"error": "agent_id and target_id must be integers"}, status=400)
-
-            content = payload.get("content")
-            if not content:
-                return web.json_response({"error": "content is required"}, status=400)
-
-            interaction_type = payload.get("interaction_type", "chat")
-            interaction = {
-                "type": interaction_type,
-                "source_id": agent_id,
-                "target_id": target_id,
-                "content": content,
-            }
-
-            if not self.enqueue_interaction(interaction):
-                return web.json_response({"error": "Failed to queue interaction"}, status=400)
+        if not self.enqueue_interaction(interaction):
+            return _json_response({"error": "Failed to queue interaction"}, status=400)
+
+        self.add_log_entry(
+            "INFO",
+            f"Queued {interaction_type} from agent {agent_id} to {target_id}",
+            agent_id=agent_id,
+        )
+        return _json_response({"status": "queued", "interaction": interaction})
+
+    def _trinity_broadcast(self, payload: Dict[str, Any]) -> web.Response:
+        """Deliver a Trinity message to all agents or the listed targets."""
+        content = payload.get("content")
+        if not content:
+            return _json_response({"error": "content is required"}, status=400)
+
+        targets = payload.get("targets")
+        target_ids = None
+        if targets is not None:
+            if not isinstance(targets, list):
+                return _json_response({"error": "targets must be a list"}, status=400)
+            if not all(type(t) is int for t in targets):
+                return _json_response({"error": "targets must be integers"}, status=400)
+            target_ids = targets
+
+        delivered = self.broadcast_from_trinity(content, target_ids)
+        self.add_log_entry("INFO", f"Trinity broadcast: {content}")
+        return _json_response({"status": "broadcast", "delivered": delivered})
+
+    def _trinity_set_era(self, payload: Dict[str, Any]) -> web.Response:
+        """Replace the era prompt of the running simulation."""
+        new_era = payload.get("era")
+        if not new_era:
+            return _json_response({"error": "era is required"}, status=400)
 
-            self.add_log_entry(
-                "INFO",
-                f"Queued {interaction_type} from agent {agent_id} to {target_id}",
-                agent_id=agent_id,
-            )
-            return web.json_response({"status": "queued", "interaction": interaction})
-
-        if role == "trinity":
-            action = payload.get("action", "broadcast")
-
-            if action == "broadcast":
-                content = payload.get("content")
-                if not content:
-                    return web.json_response({"error": "content is required"}, status=400)
-
-                targets = payload.get("targets")
-                target_ids = None
-                if targets is not None:
-                    if not isinstance(targets, list):
-                        return web.json_response({"error": "targets must be a list"}, status=400)
-                    try:
-                        target_ids = [int(t) for t in targets]
-                    except (TypeError, ValueError):
-                        return web.json_response({"error": "targets must be integers"}, status=400)
-
-                delivered = self.broadcast_from_trinity(content, target_ids)
-                self.add_log_entry("INFO", f"Trinity broadcast: {content}")
-                return web.json_response({"status": "broadcast", "delivered": delivered})
-
-            if action == "set_era":
-                new_era = payload.get("era")
-                if not new_era:
-                    return web.json_response({"error": "era is required"}, status=400)
-
-                world = self.get_world()
-                world.trinity.era_prompt = new_era
-                self.simulation_status["era"] = new_era
-                if self.current_data.get("world"):
-                    self.current_data["world"]["era"] = new_era
-                self.add_log_entry("INFO", f"Era updated to {new_era} by operator")
-                return web.json_response({"status": "era_updated", "era": new_era})
-
-            return web.json_response({"error": f"Unknown Trinity action '{action}'"}, status=400)
-
-        return web.json_response({"error": f"Unknown role '{role}'"}, status=400)
+        world = self.get_world()
+        world.trinity.era_prompt = new_era
+        self.simulation_status["era"] = new_era
+        if self.current_data.get("world"):
+            self.current_data["world"]["era"] = new_era
+            self._world_version += 1
+            self._data_version += 1
+        self.add_log_entry("INFO", f"Era updated to {new_era} by operator")
+        return _json_response({"status": "era_updated", "era": new_era})
     
     async def start_http_server(self, host: str = "localhost", port: int = 8080):
         """Start HTTP server."""
@@ -909,6 +1594,9 @@ class MonitorSimulationController:
         self._task: Optional[asyncio.Task] = None
         self._lock = asyncio.Lock()
         self._active_config: Optional[DictConfig] = None
+        # Composed configs by override list, so repeated starts skip Hydra
+        self._config_cache: "OrderedDict[Tuple[str, ...], DictConfig]" = OrderedDict()
+        self.max_cached_configs = 32
 
     def is_running(self) -> bool:
         return self._task is not None and not self._task.done()
@@ -949,6 +1637,22 @@ class MonitorSimulationController:
         return self._active_config
 
     def _compose_config(self, overrides: List[str]) -> DictConfig:
+        """Compose the Hydra config, reusing an earlier composition of the same overrides.
+
+        Each caller gets its own copy, so runs cannot alter the cached config.
+        """
+        key = tuple(overrides)
+        cached = self._config_cache.get(key)
+        if cached is None:
+            cached = self._compose_uncached(overrides)
+            self._config_cache[key] = cached
+            if len(self._config_cache) > self.max_cached_configs:
+                self._config_cache.popitem(last=False)
+        else:
+            self._config_cache.move_to_end(key)
+        return copy.deepcopy(cached)
+
+    def _compose_uncached(self, overrides: List[str]) -> DictConfig:
         config_dir = Path(__file__).parent / "conf"
 
         try:
@@ -966,8 +1670,20 @@ class MonitorSimulationController:
     async def _run(self, cfg: DictConfig) -> None:
         from .main import run_simulation_from_config
 
+        def run_blocking() -> None:
+            asyncio.run(run_simulation_from_config(cfg, monitor=self.monitor))
+
         try:
-            await run_simulation_from_config(cfg, monitor=self.monitor)
+            # The simulation gets its own loop in a worker thread, so turns that
+            # hog the CPU never stall the API or WebSocket writers. The monitor
+            # methods it calls are safe from any thread.
+            await asyncio.to_thread(run_blocking)
+            # Deliver the final turn and "finished" logs before reporting done
+            await self.monitor.flush()
+        except asyncio.CancelledError:
+            # The thread cannot be cancelled; have it stop after this turn
+            self.monitor.request_stop()
+            raise
         except Exception as exc:  # pragma: no cover - runtime guard
             self.monitor.update_status(
                 state="error",
@@ -990,44 +1706,98 @@ class MonitorSimulationController:
 
 # Global monitor instance
 _global_monitor = None
+_monitor_lock = threading.Lock()
 
 def get_monitor() -> SimulationMonitor:
-    """Get the global monitor instance."""
+    """Get the global monitor instance, creating it once across threads."""
     global _global_monitor
     if _global_monitor is None:
-        _global_monitor = SimulationMonitor()
+        with _monitor_lock:
+            if _global_monitor is None:
+                _global_monitor = SimulationMonitor()
     return _global_monitor
 
+# Background server thread started by start_web_servers
+_servers_thread: Optional[threading.Thread] = None
+_servers_lock = threading.Lock()
+
 def start_web_servers(host: str = "localhost", ws_port: int = 8765, http_port: int = 8080):
-    """Start both WebSocket and HTTP servers."""
+    """Start both WebSocket and HTTP servers in a background thread.
+
+    The returned thread has a `stop()` method that shuts the servers down
+    from any thread; join the thread afterwards to wait for cleanup. While
+    it is alive, further calls return the same thread.
+    """
+    global _servers_thread
+    with _servers_lock:
+        if _servers_thread is not None and _servers_thread.is_alive():
+            return _servers_thread
+        _servers_thread = _spawn_web_servers(host, ws_port, http_port)
+        return _servers_thread
+
+async def start_web_servers_async(host: str = "localhost", ws_port: int = 8765,
+                                  http_port: int = 8080) -> Callable[[], Awaitable[None]]:
+    """Start both servers on the running event loop and return their shutdown coroutine.
+
+    Use this when the simulation runs on the same loop: monitor updates and
+    log entries are then scheduled with `call_soon` instead of being handed
+    to a server thread.
+    """
     monitor = get_monitor()
+    monitor.setup_http_server(host, http_port)
+    http_runner = await monitor.start_http_server(host, http_port)
+    await monitor.start_websocket_server(host, ws_port)
+
+    logger.info(f"Web servers started:")
+    logger.info(f"  Web UI: http://{host}:{http_port}")
+    logger.info(f"  WebSocket: ws://{host}:{ws_port}")
+
+    async def shutdown():
+        await monitor.stop_websocket_server()
+        if http_runner:
+            await http_runner.cleanup()
+
+    return shutdown
+
+def _spawn_web_servers(host: str, ws_port: int, http_port: int) -> threading.Thread:
+    """Create and start the server thread for `start_web_servers`."""
+    stop_requested = threading.Event()
+    loop: Optional[asyncio.AbstractEventLoop] = None
+    stop_event: Optional[asyncio.Event] = None
     
     async def run_servers():
-        # Setup HTTP server
-        http_app = monitor.setup_http_server(host, http_port)
-        http_runner = await monitor.start_http_server(host, http_port)
+        nonlocal loop, stop_event
+        shutdown = await start_web_servers_async(host, ws_port, http_port)
         
-        # Start WebSocket server
-        await monitor.start_websocket_server(host, ws_port)
-        
-        logger.info(f"Web servers started:")
-        logger.info(f"  Web UI: http://{host}:{http_port}")
-        logger.info(f"  WebSocket: ws://{host}:{ws_port}")
-        
-        # Keep servers running
+        # Keep servers running until stop() is called
         try:
-            await asyncio.Future()  # Run forever
-        except KeyboardInterrupt:
+            stop_event = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            if stop_requested.is_set():
+                stop_event.set()
+            await stop_event.wait()
             logger.info("Shutting down web servers...")
         finally:
-            await monitor.stop_websocket_server()
-            if http_runner:
-                await http_runner.cleanup()
+            await shutdown()
+
+    def stop():
+        """Shut the servers down; safe to call from any thread, more than once."""
+        stop_requested.set()
+        if loop is not None and stop_event is not None:
+            try:
+                loop.call_soon_threadsafe(stop_event.set)
+            except RuntimeError:
+                # Loop already closed
+                pass
     
-    # Run in separate thread
+    # Run in separate thread, on uvloop when installed (not on Windows)
     def run_in_thread():
-        asyncio.run(run_servers())
+        if uvloop is not None:
+            uvloop.run(run_servers())
+        else:
+            asyncio.run(run_servers())
     
     thread = threading.Thread(target=run_in_thread, daemon=True)
+    thread.stop = stop
     thread.start()
     return thread
@@ -47,6 +47,8 @@ class World:
         trinity: World rules manager
         map: Terrain map
         resources: Resource distribution
+        terrain_version: Bumped whenever `map` tiles change (web monitor cache key)
+        resources_version: Bumped whenever `resources` change (web monitor cache key)
         social_manager: Social structures manager
         cultural_memory: Cultural memory and knowledge system
         tech_system: Technology progression system
@@ -64,6 +66,9 @@ class World:
         self.trinity = Trinity(self.bible, era_prompt)
         self.map = None
         self.resources = {}
+        # Mutation counters; any code that edits map/resources in place must bump these
+        self.terrain_version = 0
+        self.resources_version = 0
         # Terrain indices for fast queries
         self.terrain_positions: Dict[str, List[tuple]] = {}
         self.terrain_counts: Dict[str, int] = {}
@@ -112,6 +117,7 @@ class World:
         logger.info("="*40 + "\n")
         
         self.map = self.generate_realistic_terrain()
+        self.terrain_version += 1
         self.resources = {}
         self._build_terrain_index()
         self.place_resources()
@@ -123,6 +129,7 @@ class World:
             self.trinity.terrain_types = DEFAULT_TERRAIN
             self.trinity.resource_rules = DEFAULT_RESOURCE_RULES
             self.map = self.generate_realistic_terrain()
+            self.terrain_version += 1
             self.resources = {}
             self.place_resources()
         
@@ -250,6 +257,7 @@ class World:
             return
             
         resource_rules = getattr(self.trinity, "resource_rules", DEFAULT_RESOURCE_RULES)
+        self.resources_version += 1
         # Sample positions per terrain to match expected count without full traversal
         for resource, terrain_probs in resource_rules.items():
             for terrain, prob in terrain_probs.items():
@@ -430,6 +438,7 @@ class World:
                 tile_resources[res] = available - take_n
                 if tile_resources[res] == 0:
                     del tile_resources[res]
+                self.world.resources_version += 1
                 changes[res] = changes.get(res, 0) + take_n
                 return take_n
 
@@ -874,8 +883,10 @@ class World:
         action_handler.session = session
         turn_log = []
         
-        # Process pending interactions
-        for interaction in self.pending_interactions:
+        # Process pending interactions; take the batch up front so ones queued
+        # while these are handled wait for the next turn instead of being lost
+        pending, self.pending_interactions = self.pending_interactions, []
+        for interaction in pending:
             target_agent = next((a for a in self.agents if a.aid == interaction["target_id"]), None)
             if not target_agent:
                 continue
@@ -925,8 +936,6 @@ class World:
                     target_agent.log.append(f"智能体 {source_agent.aid} 试图交换但资源不足")
                     turn_log.append(f"{source_agent.name}({source_agent.aid}) ↔ {target_agent.name}({target_agent.aid}): 交换失败")
         
-        self.pending_interactions = []
-        
         # Process all agents
         tasks = []
         for agent in self.agents:
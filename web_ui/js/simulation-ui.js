@@ -569,7 +569,22 @@ class SimulationUI {
         this.draw();
     }
     
+    decodeTerrain(world, previousLegend) {
+        // Terrain arrives as base64 byte codes into terrain_legend; a delta
+        // omits the legend when it has not changed
+        if (!world || typeof world.terrain_codes !== 'string') return;
+        const raw = atob(world.terrain_codes);
+        const legend = world.terrain_legend || previousLegend || [];
+        const terrain = new Array(raw.length);
+        for (let i = 0; i < raw.length; i++) {
+            terrain[i] = legend[raw.charCodeAt(i)] || 'GRASSLAND';
+        }
+        world.terrain = terrain;
+        delete world.terrain_codes;
+    }
+    
     updateSimulationData(data) {
+        this.decodeTerrain(data.world);
         this.worldData = data.world;
         this.agents = data.agents || [];
         this.updateUI();
@@ -705,15 +720,35 @@ class SimulationUI {
             case 'simulation_update':
                 this.updateSimulationData(data.data);
                 break;
+            case 'simulation_delta':
+                this.applySimulationDelta(data.data);
+                break;
             case 'agent_update':
                 this.updateAgent(data.data);
                 break;
             case 'log_entry':
                 this.addLogEntry(data.data);
                 break;
+            case 'logs_batch':
+                (data.data || []).forEach(entry => this.addLogEntry(entry));
+                break;
         }
     }
     
+    applySimulationDelta(delta) {
+        // Changed world fields and agents arrive whole; removed agents by aid
+        this.decodeTerrain(delta.world, this.worldData && this.worldData.terrain_legend);
+        this.worldData = Object.assign(this.worldData || {}, delta.world || {});
+        const changes = delta.agents || {};
+        const removed = new Set(changes.removed || []);
+        const byId = new Map();
+        this.agents.forEach(a => { if (!removed.has(a.aid)) byId.set(a.aid, a); });
+        (changes.updated || []).forEach(a => byId.set(a.aid, a));
+        this.agents = Array.from(byId.values());
+        this.updateUI();
+        this.draw();
+    }
+    
     updateAgent(agentData) {
         const index = this.agents.findIndex(a => a.aid === agentData.aid);
         if (index !== -1) {
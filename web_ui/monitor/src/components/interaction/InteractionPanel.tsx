@@ -14,14 +14,15 @@ export function InteractionPanel(): JSX.Element {
 
   async function onSendTrinity() {
     if (!trinityMsg.trim()) return;
+    const targets = trinityTargets
+      .split(",")
+      .map((s) => s.trim())
+      .filter(Boolean)
+      .map((n) => Number(n));
+    // Refuse rather than drop bad IDs: an empty list would broadcast to everyone
+    if (!targets.every((n) => Number.isInteger(n))) return;
     setBusy(true);
     try {
-      const targets = trinityTargets
-        .split(",")
-        .map((s) => s.trim())
-        .filter(Boolean)
-        .map((n) => Number(n))
-        .filter((n) => Number.isFinite(n));
       await trinityBroadcast(trinityMsg.trim(), targets.length ? targets : undefined);
       setTrinityMsg("");
       setTrinityTargets("");
@@ -31,9 +32,10 @@ export function InteractionPanel(): JSX.Element {
   }
 
   async function onSendAgent() {
+    if (!agentFrom.trim() || !agentTo.trim()) return;
     const a = Number(agentFrom);
     const b = Number(agentTo);
-    if (!Number.isFinite(a) || !Number.isFinite(b) || !agentMsg.trim()) return;
+    if (!Number.isInteger(a) || !Number.isInteger(b) || !agentMsg.trim()) return;
     setBusy(true);
     try {
       await agentInteraction(a, b, agentMsg.trim());
@@ -1,12 +1,24 @@
 import { useEffect } from "react";
 import { useSimulationStore } from "../state/store";
 import {
+  applySimulationDelta,
   buildAgentActionMap,
   mapSnapshotToTurnPayload,
   normalizeActionEvents,
   normalizeLogEntries
 } from "./transformers";
 
+// Ask for binary frames: same JSON, but no UTF-8 validation of text frames
+const BINARY_SUBPROTOCOL = "genesis.binary";
+// Or, where the browser can inflate, the same JSON zlib-compressed by the server
+const DEFLATE_SUBPROTOCOL = "genesis.deflate";
+const textDecoder = new TextDecoder();
+
+function inflateText(data: ArrayBuffer): Promise<string> {
+  const stream = new Blob([data]).stream().pipeThrough(new DecompressionStream("deflate"));
+  return new Response(stream).text();
+}
+
 export function useMonitorStream(): void {
   const ingestTurn = useSimulationStore((s) => s.ingestTurn);
   const updateConnection = useSimulationStore((s) => s.updateConnection);
@@ -22,11 +34,77 @@ export function useMonitorStream(): void {
     let ws: WebSocket | null = null;
     let reconnectAttempts = 0;
     let closed = false;
+    // Last full snapshot; per-turn deltas are merged into it
+    let snapshot: any = null;
+    // Pending decompression of `genesis.deflate` frames
+    let inflating: Promise<void> = Promise.resolve();
+
+    function handleText(text: string) {
+      try {
+        const msg = JSON.parse(text);
+        if (msg.type === "simulation_update") {
+          snapshot = msg.data;
+          const turn = mapSnapshotToTurnPayload(msg.data);
+          if (turn) {
+            ingestTurn(turn);
+            setAgentActions(buildAgentActionMap(turn.agents));
+          }
+          const normalizedActions = normalizeActionEvents(msg.data?.actions ?? []);
+          for (const { interaction, agentId, actionText } of normalizedActions) {
+            recordInteraction(interaction);
+            if (agentId && actionText) {
+              updateAgentAction(agentId, actionText);
+            }
+          }
+          const structures = Array.isArray(msg.data?.structures) ? msg.data.structures : null;
+          if (structures) setStructures(structures);
+          const logEntries = normalizeLogEntries(msg.data?.logs ?? []);
+          if (logEntries.length) {
+            replaceLogs(logEntries.slice(-200));
+          }
+        } else if (msg.type === "simulation_delta") {
+          snapshot = applySimulationDelta(snapshot, msg.data);
+          const turn = mapSnapshotToTurnPayload(snapshot);
+          if (turn) {
+            ingestTurn(turn);
+            setAgentActions(buildAgentActionMap(turn.agents));
+          }
+        } else if (msg.type === "log_entry" || msg.type === "logs_batch") {
+          const raw = msg.type === "logs_batch" ? msg.data ?? [] : [msg.data];
+          const entries = normalizeLogEntries(raw);
+          if (entries.length) {
+            appendLogs(entries);
+          }
+        } else if (msg.type === "logs_update") {
+          const entries = normalizeLogEntries(msg.data?.logs ?? []);
+          if (entries.length) {
+            replaceLogs(entries);
+          }
+        } else if (msg.type === "actions_update") {
+          const normalizedEvents = normalizeActionEvents(msg.data?.events ?? []);
+          for (const { interaction, agentId, actionText } of normalizedEvents) {
+            recordInteraction(interaction);
+            if (agentId && actionText) {
+              updateAgentAction(agentId, actionText);
+            }
+          }
+        } else if (msg.type === "structures_update") {
+          const items = (msg.data?.structures ?? []) as any[];
+          if (items.length) mergeStructures(items);
+        }
+      } catch {
+        // ignore bad messages
+      }
+    }
 
     function connect() {
       updateConnection({ status: "connecting" });
       const url = buildWsUrl();
-      ws = new WebSocket(url);
+      const protocols = typeof DecompressionStream === "undefined"
+        ? [BINARY_SUBPROTOCOL]
+        : [DEFLATE_SUBPROTOCOL, BINARY_SUBPROTOCOL];
+      ws = new WebSocket(url, protocols);
+      ws.binaryType = "arraybuffer";
 
       ws.onopen = () => {
         reconnectAttempts = 0;
@@ -36,51 +114,12 @@ export function useMonitorStream(): void {
       };
 
       ws.onmessage = (evt) => {
-        try {
-          const msg = JSON.parse(evt.data);
-          if (msg.type === "simulation_update") {
-            const turn = mapSnapshotToTurnPayload(msg.data);
-            if (turn) {
-              ingestTurn(turn);
-              setAgentActions(buildAgentActionMap(turn.agents));
-            }
-            const normalizedActions = normalizeActionEvents(msg.data?.actions ?? []);
-            for (const { interaction, agentId, actionText } of normalizedActions) {
-              recordInteraction(interaction);
-              if (agentId && actionText) {
-                updateAgentAction(agentId, actionText);
-              }
-            }
-            const structures = Array.isArray(msg.data?.structures) ? msg.data.structures : null;
-            if (structures) setStructures(structures);
-            const logEntries = normalizeLogEntries(msg.data?.logs ?? []);
-            if (logEntries.length) {
-              replaceLogs(logEntries.slice(-200));
-            }
-          } else if (msg.type === "log_entry") {
-            const entries = normalizeLogEntries([msg.data]);
-            if (entries.length) {
-              appendLogs(entries);
-            }
-          } else if (msg.type === "logs_update") {
-            const entries = normalizeLogEntries(msg.data?.logs ?? []);
-            if (entries.length) {
-              replaceLogs(entries);
-            }
-          } else if (msg.type === "actions_update") {
-            const normalizedEvents = normalizeActionEvents(msg.data?.events ?? []);
-            for (const { interaction, agentId, actionText } of normalizedEvents) {
-              recordInteraction(interaction);
-              if (agentId && actionText) {
-                updateAgentAction(agentId, actionText);
-              }
-            }
-          } else if (msg.type === "structures_update") {
-            const items = (msg.data?.structures ?? []) as any[];
-            if (items.length) mergeStructures(items);
-          }
-        } catch {
-          // ignore bad messages
+        if (ws?.protocol === DEFLATE_SUBPROTOCOL) {
+          // Inflating is async; chain it so messages are handled in order
+          const data = evt.data as ArrayBuffer;
+          inflating = inflating.then(() => inflateText(data)).then(handleText, () => {});
+        } else {
+          handleText(typeof evt.data === "string" ? evt.data : textDecoder.decode(evt.data));
         }
       };
 
@@ -0,0 +1,87 @@
+import { describe, expect, it } from "vitest";
+import { applySimulationDelta, decodeTerrain, mapSnapshotToTurnPayload } from "./transformers";
+
+function encodeCodes(codes: number[]): string {
+  return btoa(String.fromCharCode(...codes));
+}
+
+const baseSnapshot = {
+  turn: 3,
+  timestamp: 100,
+  world: {
+    size: 2,
+    turn: 3,
+    era: "Stone Age",
+    terrain_codes: encodeCodes([0, 0, 1, 1]),
+    terrain_legend: ["GRASSLAND", "WATER"],
+    resources: [{}, {}, {}, {}]
+  },
+  agents: [
+    { aid: 1, name: "A1", x: 0, y: 0 },
+    { aid: 2, name: "A2", x: 1, y: 0 },
+    { aid: 3, name: "A3", x: 1, y: 1 }
+  ],
+  logs: [{ message: "ready" }]
+};
+
+describe("applySimulationDelta", () => {
+  it("merges changed world fields and agents into the previous snapshot", () => {
+    const merged = applySimulationDelta(baseSnapshot, {
+      turn: 4,
+      timestamp: 101,
+      world: { turn: 4, era: "Bronze Age" },
+      agents: { updated: [{ aid: 2, name: "A2", x: 0, y: 1 }, { aid: 4, name: "A4", x: 0, y: 0 }], removed: [] }
+    });
+
+    expect(merged.turn).toBe(4);
+    expect(merged.timestamp).toBe(101);
+    expect(merged.world.era).toBe("Bronze Age");
+    expect(merged.world.size).toBe(2);
+    expect(merged.world.terrain_codes).toBe(baseSnapshot.world.terrain_codes);
+    expect(merged.logs).toBe(baseSnapshot.logs);
+    expect(merged.agents.map((agent: any) => agent.aid)).toEqual([1, 2, 3, 4]);
+    expect(merged.agents[1]).toEqual({ aid: 2, name: "A2", x: 0, y: 1 });
+    // Unchanged agents keep their object; the previous snapshot is not mutated
+    expect(merged.agents[0]).toBe(baseSnapshot.agents[0]);
+    expect(baseSnapshot.agents[1].x).toBe(1);
+    expect(baseSnapshot.world.era).toBe("Stone Age");
+  });
+
+  it("drops removed agents", () => {
+    const merged = applySimulationDelta(baseSnapshot, {
+      turn: 4,
+      world: {},
+      agents: { updated: [], removed: [1, 3] }
+    });
+
+    expect(merged.agents.map((agent: any) => agent.aid)).toEqual([2]);
+  });
+
+  it("leaves the snapshot alone for an empty delta", () => {
+    expect(applySimulationDelta(baseSnapshot, null)).toBe(baseSnapshot);
+  });
+});
+
+describe("decodeTerrain", () => {
+  it("decodes terrain codes in row-major order through the legend", () => {
+    expect(decodeTerrain(baseSnapshot.world)).toEqual(["GRASSLAND", "GRASSLAND", "WATER", "WATER"]);
+  });
+
+  it("uses the legend carried over from the previous snapshot", () => {
+    // Only the codes changed, so the delta carries no terrain_legend
+    const merged = applySimulationDelta(baseSnapshot, {
+      turn: 4,
+      world: { terrain_codes: encodeCodes([1, 0, 0, 1]) },
+      agents: { updated: [], removed: [] }
+    });
+
+    expect(merged.world.terrain_legend).toBe(baseSnapshot.world.terrain_legend);
+    expect(decodeTerrain(merged.world)).toEqual(["WATER", "GRASSLAND", "GRASSLAND", "WATER"]);
+    expect(mapSnapshotToTurnPayload(merged)?.world.terrain).toEqual(["WATER", "GRASSLAND", "GRASSLAND", "WATER"]);
+  });
+
+  it("prefers a plain terrain list and tolerates missing codes", () => {
+    expect(decodeTerrain({ terrain: ["FOREST"] })).toEqual(["FOREST"]);
+    expect(decodeTerrain({ terrain_legend: ["GRASSLAND"] })).toEqual([]);
+  });
+});
@@ -58,6 +58,30 @@ function mapWorldGroups(groups: any): WorldGroupSummary[] | undefined {
     .sort((a, b) => b.member_count - a.member_count);
 }
 
+let terrainCache: { codes: string; legend: unknown[]; terrain: string[] } | null = null;
+
+// Terrain arrives as base64 byte codes into `terrain_legend`; decode once per map
+export function decodeTerrain(worldPayload: any): string[] {
+  if (Array.isArray(worldPayload.terrain)) {
+    return worldPayload.terrain;
+  }
+  const codes = worldPayload.terrain_codes;
+  const legend = worldPayload.terrain_legend;
+  if (typeof codes !== "string" || !Array.isArray(legend)) {
+    return [];
+  }
+  if (terrainCache && terrainCache.codes === codes && terrainCache.legend === legend) {
+    return terrainCache.terrain;
+  }
+  const raw = atob(codes);
+  const terrain = new Array<string>(raw.length);
+  for (let i = 0; i < raw.length; i += 1) {
+    terrain[i] = safeString(legend[raw.charCodeAt(i)] ?? "GRASSLAND");
+  }
+  terrainCache = { codes, legend, terrain };
+  return terrain;
+}
+
 export function mapSnapshotToTurnPayload(snapshot: any): TurnPayload | null {
   if (!snapshot || typeof snapshot !== "object" || !snapshot.world) {
     return null;
@@ -73,7 +97,7 @@ export function mapSnapshotToTurnPayload(snapshot: any): TurnPayload | null {
 
   const world: WorldState = {
     size: safeNumber(worldPayload.size),
-    terrain: Array.isArray(worldPayload.terrain) ? worldPayload.terrain : [],
+    terrain: decodeTerrain(worldPayload),
     resources: Array.isArray(worldPayload.resources) ? worldPayload.resources : [],
     era: typeof worldPayload.era === "string" ? worldPayload.era : undefined,
     turn: worldTurn,
@@ -153,6 +177,35 @@ export function mapSnapshotToTurnPayload(snapshot: any): TurnPayload | null {
   return payload;
 }
 
+/**
+ * Merge a `simulation_delta` message into the last full snapshot.
+ * Changed world fields and agents arrive whole; removed agents are listed by aid.
+ */
+export function applySimulationDelta(snapshot: any, delta: any): any {
+  if (!delta || typeof delta !== "object") {
+    return snapshot;
+  }
+  const base = snapshot && typeof snapshot === "object" ? snapshot : {};
+  const changes = delta.agents ?? {};
+  const removed = new Set<unknown>(Array.isArray(changes.removed) ? changes.removed : []);
+  const agents = new Map<unknown, any>();
+  for (const agent of Array.isArray(base.agents) ? base.agents : []) {
+    if (!removed.has(agent?.aid)) {
+      agents.set(agent?.aid, agent);
+    }
+  }
+  for (const agent of Array.isArray(changes.updated) ? changes.updated : []) {
+    agents.set(agent?.aid, agent);
+  }
+  return {
+    ...base,
+    world: { ...(base.world ?? {}), ...(delta.world ?? {}) },
+    agents: Array.from(agents.values()),
+    turn: delta.turn ?? base.turn,
+    timestamp: delta.timestamp ?? base.timestamp
+  };
+}
+
 export function buildAgentActionMap(agents: AgentSummary[]): Record<string, string> {
   const map: Record<string, string> = {};
   for (const agent of agents) {